@@ -0,0 +1,412 @@
+# Local load benchmark for main.py's event handlers (on_message, on_voice_state_update,
+# on_member_join). Runs against an in-memory repository by default, or the database in
+# DATABASE_URL with --postgres (it seeds config rows for guild ids starting at 7000000000).
+#
+#   python benchmark.py --events 20000 --guilds 10 --users 500 --sticky --deadchat
+#   DATABASE_URL=postgres://... python benchmark.py --postgres --rate 500
+
+############### IMPORTS ###############
+import sys
+import asyncio
+import argparse
+import random
+import types
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from time import perf_counter
+
+import discord
+
+import main
+
+############### STUB DISCORD OBJECTS ###############
+# Just enough of discord.py's surface for the event handlers in main.py. Every API call a
+# handler makes is counted in API_CALLS instead of going over the network.
+API_CALLS = {"count": 0}
+_ids = iter(range(10**15, 10**16))
+
+class StubRole:
+    def __init__(self, guild, role_id: int):
+        self.guild = guild
+        self.id = role_id
+        self.name = f"role-{role_id}"
+        self.mention = f"<@&{role_id}>"
+
+    @property
+    def members(self):
+        return [m for m in self.guild.members if self in m.roles]
+
+    def is_default(self) -> bool:
+        return self.id == self.guild.id
+
+class StubMessage:
+    def __init__(self, guild, channel, author, content: str = ""):
+        self.id = next(_ids)
+        self.guild = guild
+        self.channel = channel
+        self.author = author
+        self.content = content
+        self.created_at = datetime.now(timezone.utc)
+
+    async def delete(self, **kwargs):
+        API_CALLS["count"] += 1
+
+    async def edit(self, **kwargs):
+        API_CALLS["count"] += 1
+        return self
+
+class StubChannel:
+    def __init__(self, guild, channel_id: int):
+        self.guild = guild
+        self.id = channel_id
+        self.name = f"channel-{channel_id}"
+        self.mention = f"<#{channel_id}>"
+
+    async def send(self, content=None, **kwargs):
+        API_CALLS["count"] += 1
+        return StubMessage(self.guild, self, self.guild.me, content or "")
+
+    async def fetch_message(self, message_id: int):
+        API_CALLS["count"] += 1
+        return StubMessage(self.guild, self, self.guild.me)
+
+    def get_partial_message(self, message_id: int):
+        msg = StubMessage(self.guild, self, self.guild.me)
+        msg.id = message_id
+        return msg
+
+    async def delete_messages(self, messages, **kwargs):
+        API_CALLS["count"] += 1
+
+class StubMember(discord.Member):
+    """A discord.Member subclass built without a gateway payload so isinstance checks pass."""
+
+    __slots__ = ("_stub_id", "_stub_guild", "_stub_roles", "_stub_bot")
+
+    def __init__(self, guild, user_id: int, bot: bool = False):
+        self._stub_id = user_id
+        self._stub_guild = guild
+        self._stub_roles = []
+        self._stub_bot = bot
+
+    id = property(lambda self: self._stub_id)
+    guild = property(lambda self: self._stub_guild)
+    roles = property(lambda self: self._stub_roles)
+    bot = property(lambda self: self._stub_bot)
+    mention = property(lambda self: f"<@{self._stub_id}>")
+    display_name = property(lambda self: f"user-{self._stub_id}")
+
+    def __str__(self):
+        return self.display_name
+
+    async def add_roles(self, *roles, **kwargs):
+        API_CALLS["count"] += 1
+        self._stub_roles.extend(r for r in roles if r not in self._stub_roles)
+
+    async def remove_roles(self, *roles, **kwargs):
+        API_CALLS["count"] += 1
+        self._stub_roles[:] = [r for r in self._stub_roles if r not in roles]
+
+    async def edit(self, *, roles=None, **kwargs):
+        API_CALLS["count"] += 1
+        if roles is not None:
+            self._stub_roles[:] = list(roles)
+
+class StubGuild:
+    def __init__(self, guild_id: int, channels: int, users: int):
+        self.id = guild_id
+        self.name = f"guild-{guild_id}"
+        self._roles = {}
+        self.active_role = self.add_role(guild_id + 1)
+        self.voice_role = self.add_role(guild_id + 2)
+        self._channels = {guild_id + 100 + i: StubChannel(self, guild_id + 100 + i) for i in range(channels)}
+        self._voice = {guild_id + 50_000 + i: StubChannel(self, guild_id + 50_000 + i) for i in range(max(1, channels // 4))}
+        self._members = {guild_id + 100_000 + i: StubMember(self, guild_id + 100_000 + i) for i in range(users)}
+        self.me = StubMember(self, guild_id + 99, bot=True)
+
+    def add_role(self, role_id: int) -> StubRole:
+        role = StubRole(self, role_id)
+        self._roles[role_id] = role
+        return role
+
+    @property
+    def members(self):
+        return list(self._members.values())
+
+    @property
+    def text_channels(self):
+        return list(self._channels.values())
+
+    @property
+    def voice_channels(self):
+        return list(self._voice.values())
+
+    def get_role(self, role_id: int):
+        return self._roles.get(int(role_id))
+
+    def get_member(self, user_id: int):
+        return self._members.get(int(user_id))
+
+    def get_channel(self, channel_id: int):
+        return self._channels.get(int(channel_id)) or self._voice.get(int(channel_id))
+
+    async def audit_logs(self, **kwargs):
+        return
+        yield
+
+############### IN-MEMORY REPOSITORY ###############
+# Stand-in for the asyncpg pool: answers the queries the event handlers send with the
+# benchmark's synthetic configuration and treats everything else as an empty result.
+class FakeRepository:
+    def __init__(self, guilds: dict, args):
+        self.guilds = guilds
+        self.args = args
+        self.latency = args.fake_latency_ms / 1000.0
+
+    def settings_row(self, guild_id: int) -> dict:
+        guild = self.guilds.get(guild_id)
+        return {
+            "active_role_id": guild.active_role.id if guild else None,
+            "active_threshold_minutes": 60,
+            "active_mode": "all",
+            "deadchat_role_id": None,
+            "deadchat_idle_minutes": 30,
+            "deadchat_requires_active": False,
+            "deadchat_cooldown_minutes": 60,
+            "plague_role_id": None,
+            "plague_duration_hours": 72,
+            "plague_enabled": False,
+            "plague_scheduled_day": None,
+            "prizes_enabled": False,
+            "timezone": "UTC",
+        }
+
+    def context_row(self) -> dict:
+        return {
+            "is_activity_channel": True,
+            "deadchat_configured": self.args.deadchat,
+            "deadchat_enabled": self.args.deadchat,
+            "deadchat_idle_minutes": 0,
+            "sticky_content": "Sticky note" if self.args.sticky else None,
+            "sticky_message_id": None,
+            "delete_after_seconds": 3600 if self.args.autodelete else None,
+            "log_channel_id": None,
+        }
+
+    def answer(self, method: str, sql: str, args: tuple):
+        if method == "fetchrow":
+            if sql == main.SETTINGS_FETCH_SQL:
+                return self.settings_row(int(args[0]))
+            if sql == main.MESSAGE_CONTEXT_SQL:
+                return self.context_row()
+            return None
+        if method == "fetch":
+            if "FROM voice_role_links" in sql:
+                guild = self.guilds.get(int(args[0]))
+                if guild is None:
+                    return []
+                return [{"voice_channel_id": vc.id, "role_id": guild.voice_role.id, "mode": "add_on_join"} for vc in guild.voice_channels]
+            return []
+        if method == "fetchval":
+            return None
+        return "OK"
+
+class CountingConnection:
+    """Wraps a real or fake connection and counts each statement sent as one round trip."""
+
+    def __init__(self, pool, conn=None):
+        self._pool = pool
+        self._conn = conn
+
+    async def _call(self, method: str, sql: str, *args, **kwargs):
+        self._pool.round_trips += 1
+        if self._conn is not None:
+            return await getattr(self._conn, method)(sql, *args, **kwargs)
+        if self._pool.repo.latency:
+            await asyncio.sleep(self._pool.repo.latency)
+        return self._pool.repo.answer(method, sql, args)
+
+    async def execute(self, sql, *args, **kwargs):
+        return await self._call("execute", sql, *args, **kwargs)
+
+    async def executemany(self, sql, *args, **kwargs):
+        return await self._call("executemany", sql, *args, **kwargs)
+
+    async def fetch(self, sql, *args, **kwargs):
+        return await self._call("fetch", sql, *args, **kwargs)
+
+    async def fetchrow(self, sql, *args, **kwargs):
+        return await self._call("fetchrow", sql, *args, **kwargs)
+
+    async def fetchval(self, sql, *args, **kwargs):
+        return await self._call("fetchval", sql, *args, **kwargs)
+
+    def transaction(self, **kwargs):
+        if self._conn is not None:
+            return self._conn.transaction(**kwargs)
+        return _null_transaction()
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+@asynccontextmanager
+async def _null_transaction():
+    yield
+
+class CountingPool:
+    def __init__(self, real_pool=None, repo: FakeRepository | None = None):
+        self.real_pool = real_pool
+        self.repo = repo
+        self.round_trips = 0
+
+    @asynccontextmanager
+    async def acquire(self):
+        if self.real_pool is None:
+            yield CountingConnection(self)
+            return
+        async with self.real_pool.acquire() as conn:
+            yield CountingConnection(self, conn)
+
+    def __getattr__(self, name):
+        return getattr(self.real_pool, name)
+
+############### LOAD GENERATION ###############
+def percentile(samples: list[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    idx = min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))
+    return ordered[idx]
+
+async def seed_postgres(guilds: dict, args) -> None:
+    for guild in guilds.values():
+        await main.ensure_guild_row(guild.id)
+        await main.set_active_role(guild.id, guild.active_role.id)
+        for ch in guild.text_channels:
+            if args.deadchat:
+                await main.add_deadchat_channel(guild.id, ch.id, 0)
+            if args.sticky:
+                await main.sticky_set(guild.id, ch.id, "Sticky note")
+            if args.autodelete:
+                await main.autodelete_set_channel(guild.id, ch.id, 3600, None)
+        for vc in guild.voice_channels:
+            await main.voice_role_set_link(guild.id, vc.id, guild.voice_role.id, "add_on_join")
+
+def make_event(guilds: list, rng: random.Random, weights: tuple[int, int, int]):
+    guild = rng.choice(guilds)
+    kind = rng.choices(("message", "voice", "join"), weights=weights)[0]
+    if kind == "message":
+        msg = StubMessage(guild, rng.choice(guild.text_channels), rng.choice(guild.members), "hello")
+        return kind, main.on_message(msg)
+    if kind == "voice":
+        member = rng.choice(guild.members)
+        joining = rng.random() < 0.5
+        vc = rng.choice(guild.voice_channels)
+        before = types.SimpleNamespace(channel=None if joining else vc)
+        after = types.SimpleNamespace(channel=vc if joining else None)
+        return kind, main.on_voice_state_update(member, before, after)
+    member = StubMember(guild, next(_ids))
+    guild._members[member.id] = member
+    return kind, main.on_member_join(member)
+
+async def run(args) -> None:
+    rng = random.Random(args.seed)
+    guilds = {}
+    for i in range(args.guilds):
+        gid = 7_000_000_000 + i * 1_000_000
+        guilds[gid] = StubGuild(gid, args.channels, args.users)
+
+    async def _no_commands(message):
+        return None
+
+    main.bot.process_commands = _no_commands
+    main.bot.get_guild = lambda gid: guilds.get(int(gid))
+
+    if args.postgres:
+        if not main.DATABASE_URL:
+            raise SystemExit("--postgres needs DATABASE_URL")
+        await main.init_db()
+        await seed_postgres(guilds, args)
+        pool = CountingPool(real_pool=main.db_pool)
+    else:
+        pool = CountingPool(repo=FakeRepository(guilds, args))
+    main.db_pool = pool
+
+    background = [asyncio.create_task(main.activity_flush_loop())]
+    main.role_queue_start(main.bot)
+
+    weights = (args.message_weight, args.voice_weight, args.join_weight)
+    guild_list = list(guilds.values())
+    latencies = {"message": [], "voice": [], "join": []}
+    interval = 1.0 / args.rate if args.rate > 0 else 0.0
+    inflight = set()
+    sem = asyncio.Semaphore(args.concurrency)
+
+    async def _timed(kind, coro):
+        async with sem:
+            t0 = perf_counter()
+            try:
+                await coro
+            finally:
+                latencies[kind].append(perf_counter() - t0)
+
+    start = perf_counter()
+    for n in range(args.events):
+        kind, coro = make_event(guild_list, rng, weights)
+        task = asyncio.create_task(_timed(kind, coro))
+        inflight.add(task)
+        task.add_done_callback(inflight.discard)
+        if interval:
+            await asyncio.sleep(max(0.0, start + (n + 1) * interval - perf_counter()))
+        elif n % args.concurrency == 0:
+            await asyncio.sleep(0)
+    if inflight:
+        await asyncio.gather(*inflight)
+    await main.flush_activity()
+    await main.deadchat_checkpoint()
+    elapsed = perf_counter() - start
+
+    for t in background:
+        t.cancel()
+    for t in main.role_queue_tasks:
+        t.cancel()
+
+    total = sum(len(v) for v in latencies.values())
+    mode = "postgres" if args.postgres else "in-memory"
+    print(f"mode={mode} guilds={args.guilds} channels/guild={args.channels} users/guild={args.users} events={total}")
+    print(f"{'event':<10}{'count':>8}{'p50 ms':>10}{'p99 ms':>10}")
+    for kind, samples in latencies.items():
+        if samples:
+            print(f"{kind:<10}{len(samples):>8}{percentile(samples, 50) * 1000:>10.3f}{percentile(samples, 99) * 1000:>10.3f}")
+    print(f"events/sec: {total / elapsed:.1f}")
+    print(f"db round trips/event: {pool.round_trips / max(1, total):.3f}")
+    print(f"discord api calls/event: {API_CALLS['count'] / max(1, total):.3f}")
+
+    if args.postgres:
+        await pool.real_pool.close()
+        main.db_pool = None
+
+def parse_args(argv=None):
+    p = argparse.ArgumentParser(description="Drive main.py's event handlers with synthetic load.")
+    p.add_argument("--events", type=int, default=20000)
+    p.add_argument("--rate", type=float, default=0, help="events per second (0 = as fast as possible)")
+    p.add_argument("--concurrency", type=int, default=64)
+    p.add_argument("--guilds", type=int, default=10)
+    p.add_argument("--channels", type=int, default=20, help="text channels per guild")
+    p.add_argument("--users", type=int, default=500, help="members per guild")
+    p.add_argument("--message-weight", type=int, default=90)
+    p.add_argument("--voice-weight", type=int, default=8)
+    p.add_argument("--join-weight", type=int, default=2)
+    p.add_argument("--deadchat", action="store_true", help="configure every text channel for Dead Chat")
+    p.add_argument("--sticky", action="store_true", help="configure a sticky message in every text channel")
+    p.add_argument("--autodelete", action="store_true", help="configure auto-delete in every text channel")
+    p.add_argument("--postgres", action="store_true", help="run against DATABASE_URL instead of the in-memory repository")
+    p.add_argument("--fake-latency-ms", type=float, default=0.0, help="simulated round-trip time for the in-memory repository")
+    p.add_argument("--seed", type=int, default=1)
+    return p.parse_args(argv)
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(run(parse_args()))
+    except KeyboardInterrupt:
+        sys.exit(130)
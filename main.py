@@ -1,8 +1,15 @@
 ############### IMPORTS ###############
 import os
 import asyncio
+import bisect
+import heapq
+import itertools
+import json
+import re
 import uuid
+from functools import lru_cache
 from datetime import datetime, timedelta, date, time
+from time import monotonic
 from zoneinfo import ZoneInfo
 import asyncpg
 import discord
@@ -47,6 +54,55 @@ DEV_GUILD_IDS.discard(0)
 # Legacy storage channel for one-time import/preview
 LEGACY_STORAGE_CHANNEL_ID = int(os.getenv("LEGACY_STORAGE_CHANNEL_ID", "1440912334813134868"))
 
+# Safety net for guild_settings edits made outside the bot (writers invalidate immediately)
+GUILD_SETTINGS_CACHE_TTL_SECONDS = int(os.getenv("GUILD_SETTINGS_CACHE_TTL_SECONDS", "300"))
+
+# How often buffered member_activity timestamps are written to the DB
+ACTIVITY_FLUSH_SECONDS = float(os.getenv("ACTIVITY_FLUSH_SECONDS", "5"))
+
+# How often the incremental active-role sweep also re-checks every current role holder
+ACTIVE_FULL_SWEEP_SECONDS = float(os.getenv("ACTIVE_FULL_SWEEP_SECONDS", "3600"))
+
+# How often in-memory Dead Chat last-message times are checkpointed to deadchat_state
+DEADCHAT_CHECKPOINT_SECONDS = float(os.getenv("DEADCHAT_CHECKPOINT_SECONDS", "60"))
+
+# Sticky messages are reposted once a channel has been quiet for this long
+STICKY_QUIET_SECONDS = float(os.getenv("STICKY_QUIET_SECONDS", "5"))
+
+# Max delay before new auto-delete timers are persisted and due ones are processed
+AUTODELETE_FLUSH_SECONDS = float(os.getenv("AUTODELETE_FLUSH_SECONDS", "2"))
+
+# How long a downloaded QOTD question sheet is used before it is revalidated
+QOTD_SOURCE_TTL_SECONDS = float(os.getenv("QOTD_SOURCE_TTL_SECONDS", "3600"))
+
+# Shared outbound HTTP client: connection limits, retries and response size cap
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "20"))
+HTTP_MAX_PER_HOST = int(os.getenv("HTTP_MAX_PER_HOST", "5"))
+HTTP_RETRIES = int(os.getenv("HTTP_RETRIES", "2"))
+HTTP_MAX_RESPONSE_BYTES = int(os.getenv("HTTP_MAX_RESPONSE_BYTES", str(20 * 1024 * 1024)))
+
+# Pause between Discord API calls made by the background library sync
+LIBRARY_SYNC_INTERVAL_SECONDS = float(os.getenv("LIBRARY_SYNC_INTERVAL_SECONDS", "1"))
+
+# Above this many titles, library autocomplete queries Postgres (pg_trgm) instead of memory
+AUTOCOMPLETE_MEMORY_MAX = int(os.getenv("AUTOCOMPLETE_MEMORY_MAX", "20000"))
+
+# Minimum seconds between re-renders of a guild's movie pool display message
+MOVIE_POOL_RENDER_SECONDS = float(os.getenv("MOVIE_POOL_RENDER_SECONDS", "2"))
+
+# Delay before a scheduled job that raised is retried
+SCHEDULER_RETRY_SECONDS = float(os.getenv("SCHEDULER_RETRY_SECONDS", "60"))
+
+# Role operation queue: worker count and per-guild token bucket (ops per second, burst size)
+ROLE_QUEUE_WORKERS = int(os.getenv("ROLE_QUEUE_WORKERS", "4"))
+ROLE_QUEUE_GUILD_RATE = float(os.getenv("ROLE_QUEUE_GUILD_RATE", "2"))
+ROLE_QUEUE_GUILD_BURST = float(os.getenv("ROLE_QUEUE_GUILD_BURST", "10"))
+
+# asyncpg pool sizing; set DB_STATEMENT_CACHE_SIZE=0 behind a transaction-mode pgbouncer
+DB_POOL_MIN_SIZE = int(os.getenv("DB_POOL_MIN_SIZE", "1"))
+DB_POOL_MAX_SIZE = int(os.getenv("DB_POOL_MAX_SIZE", "10"))
+DB_STATEMENT_CACHE_SIZE = int(os.getenv("DB_STATEMENT_CACHE_SIZE", "100"))
+
 
 ACTIVE_MODE_CHOICES = [
     discord.app_commands.Choice(name="Any message anywhere in the server", value="all"),
@@ -113,11 +169,12 @@ PRIZE_TIME_CHOICES = [
 
 ############### GLOBAL STATE / STORAGE ###############
 db_pool = None
-active_cleanup_task = None
-plague_cleanup_task = None
+scheduler_task = None
 deadchat_cleanup_task = None
-birthday_task = None
-qotd_task = None
+activity_flush_task = None
+autodelete_task = None
+http_session = None
+role_queue_tasks = []
 deadchat_locks = {}
 
 ############### HELPER FUNCTIONS ###############
@@ -176,6 +233,11 @@ CREATE TABLE IF NOT EXISTS member_activity (
 );
 """
 
+MEMBER_ACTIVITY_INDEX_SQL = """
+CREATE INDEX IF NOT EXISTS idx_member_activity_guild_last
+ON member_activity (guild_id, last_message_at);
+"""
+
 ACTIVITY_CHANNELS_SQL = """
 CREATE TABLE IF NOT EXISTS activity_channels (
   guild_id BIGINT NOT NULL,
@@ -300,6 +362,10 @@ CREATE TABLE IF NOT EXISTS birthdays (
 );
 """
 
+BIRTHDAYS_INDEX_SQL = """
+CREATE INDEX IF NOT EXISTS idx_birthdays_guild_month_day ON birthdays (guild_id, month, day);
+"""
+
 BIRTHDAY_ANNOUNCE_LOG_SQL = """
 CREATE TABLE IF NOT EXISTS birthday_announce_log (
   guild_id BIGINT NOT NULL,
@@ -339,6 +405,17 @@ CREATE TABLE IF NOT EXISTS autodelete_ignore_phrases (
 );
 """
 
+AUTODELETE_PENDING_SQL = """
+CREATE TABLE IF NOT EXISTS autodelete_pending (
+  channel_id BIGINT NOT NULL,
+  message_id BIGINT NOT NULL,
+  guild_id BIGINT NOT NULL,
+  delete_at TIMESTAMPTZ NOT NULL,
+  PRIMARY KEY (channel_id, message_id)
+);
+CREATE INDEX IF NOT EXISTS idx_autodelete_pending_delete_at ON autodelete_pending (delete_at);
+"""
+
 VOICE_ROLE_LINKS_SQL = """
 CREATE TABLE IF NOT EXISTS voice_role_links (
   guild_id BIGINT NOT NULL,
@@ -349,6 +426,15 @@ CREATE TABLE IF NOT EXISTS voice_role_links (
 );
 """
 
+SCHEDULED_JOBS_SQL = """
+CREATE TABLE IF NOT EXISTS scheduled_jobs (
+  job_key TEXT PRIMARY KEY,
+  kind TEXT NOT NULL,
+  due_at TIMESTAMPTZ NOT NULL,
+  payload JSONB NOT NULL DEFAULT '{}'::jsonb
+);
+"""
+
 QOTD_HISTORY_SQL = """
 CREATE TABLE IF NOT EXISTS qotd_history (
   guild_id BIGINT NOT NULL,
@@ -359,6 +445,83 @@ CREATE TABLE IF NOT EXISTS qotd_history (
 );
 """
 
+MOVIE_SETTINGS_SQL = """
+CREATE TABLE IF NOT EXISTS movie_settings (
+  guild_id BIGINT PRIMARY KEY,
+  mode TEXT NOT NULL DEFAULT 'public_manual',
+  per_user_limit INT NOT NULL DEFAULT 3,
+  pool_display_channel_id BIGINT,
+  pool_display_message_id BIGINT,
+  announce_channel_id_1 BIGINT,
+  announce_channel_id_2 BIGINT,
+  library_channel_id BIGINT,
+  library_source_url TEXT,
+  updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+"""
+
+# Pool-wide duplicate guard is a unique expression index (a PRIMARY KEY cannot hold lower()).
+MOVIE_POOL_PICKS_SQL = """
+CREATE TABLE IF NOT EXISTS movie_pool_picks (
+  guild_id BIGINT NOT NULL,
+  user_id BIGINT NOT NULL,
+  title TEXT NOT NULL,
+  added_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_movie_pool_picks_guild_title
+ON movie_pool_picks (guild_id, lower(title));
+CREATE INDEX IF NOT EXISTS idx_movie_pool_picks_guild_user
+ON movie_pool_picks (guild_id, user_id);
+"""
+
+MOVIE_LIBRARY_ITEMS_SQL = """
+CREATE TABLE IF NOT EXISTS movie_library_items (
+  guild_id BIGINT NOT NULL,
+  sheet_key TEXT NOT NULL,
+  title TEXT NOT NULL,
+  poster_url TEXT,
+  trailer_url TEXT,
+  active BOOLEAN NOT NULL DEFAULT TRUE,
+  updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+  PRIMARY KEY (guild_id, sheet_key)
+);
+"""
+
+MOVIE_LIBRARY_MESSAGES_SQL = """
+CREATE TABLE IF NOT EXISTS movie_library_messages (
+  guild_id BIGINT NOT NULL,
+  sheet_key TEXT NOT NULL,
+  channel_id BIGINT NOT NULL,
+  message_id BIGINT NOT NULL,
+  updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+  PRIMARY KEY (guild_id, sheet_key)
+);
+ALTER TABLE movie_library_messages ADD COLUMN IF NOT EXISTS content_hash TEXT;
+"""
+
+MOVIE_NIGHT_HISTORY_SQL = """
+CREATE TABLE IF NOT EXISTS movie_night_history (
+  guild_id BIGINT NOT NULL,
+  title TEXT NOT NULL,
+  picked_by BIGINT,
+  picked_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+"""
+
+MOVIE_LIBRARY_TRGM_SQL = """
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+CREATE INDEX IF NOT EXISTS idx_movie_library_items_title_trgm
+ON movie_library_items USING gin (title gin_trgm_ops);
+"""
+
+SCHEMA_MIGRATIONS_SQL = """
+CREATE TABLE IF NOT EXISTS schema_migrations (
+  version INT PRIMARY KEY,
+  name TEXT NOT NULL,
+  applied_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+"""
+
 REQUIRED_TABLES = [
     "guild_settings",
     "member_activity",
@@ -433,6 +596,27 @@ async def run_test_all(interaction: discord.Interaction) -> tuple[str, list[str]
         ok_write = await ensure_can_write_guild_settings(guild_id)
         lines.append(fmt(ok_write, "Guild settings writable"))
 
+        lines.append(fmt(
+            True,
+            "Guild settings cache",
+            f"hits={guild_settings_cache_stats['hits']} misses={guild_settings_cache_stats['misses']} size={len(_guild_settings_cache)}",
+        ))
+        hs = http_stats
+        avg_ms = hs["total_ms"] / hs["requests"] if hs["requests"] else 0.0
+        lines.append(fmt(
+            True,
+            "HTTP client",
+            f"requests={hs['requests']} retries={hs['retries']} failures={hs['failures']} avg={avg_ms:.0f}ms max={hs['max_ms']:.0f}ms",
+        ))
+        ps = db_pool_stats()
+        lines.append(fmt(True, "DB pool", f"size={ps.get('size')} idle={ps.get('idle')} min={ps.get('min')} max={ps.get('max')}"))
+        lines.append(fmt(
+            True,
+            "Role queue",
+            f"pending={len(_role_pending)} queued={role_queue_stats['queued']} coalesced={role_queue_stats['coalesced']} "
+            f"api_calls={role_queue_stats['api_calls']} failed={role_queue_stats['failed']}",
+        ))
+
         try:
             s = await get_guild_settings(guild_id)
             lines.append(fmt(True, "Guild settings readable", f"tz={s['timezone']} active_mode={s['active_mode']}"))
@@ -625,40 +809,194 @@ def parse_hh_mm(s: str) -> time | None:
 def now_utc() -> datetime:
     return datetime.now(tz=ZoneInfo("UTC"))
 
-def guild_now(guild_tz: str) -> datetime:
+@lru_cache(maxsize=None)
+def tz_zone(guild_tz: str) -> ZoneInfo:
     try:
-        tz = ZoneInfo(guild_tz)
+        return ZoneInfo(guild_tz)
     except Exception:
-        tz = ZoneInfo("America/Los_Angeles")
-    return datetime.now(tz=tz)
+        return ZoneInfo("America/Los_Angeles")
+
+def guild_now(guild_tz: str) -> datetime:
+    return datetime.now(tz=tz_zone(guild_tz))
+
+# -------- Connection pool --------
+SETTINGS_FETCH_SQL = """
+SELECT active_role_id, active_threshold_minutes, active_mode,
+       deadchat_role_id, deadchat_idle_minutes, deadchat_requires_active, deadchat_cooldown_minutes,
+       plague_role_id, plague_duration_hours, plague_enabled, plague_scheduled_day,
+       prizes_enabled,
+       timezone
+FROM guild_settings
+WHERE guild_id = $1;
+"""
+
+ACTIVITY_UPSERT_SQL = """
+INSERT INTO member_activity (guild_id, user_id, last_message_at)
+SELECT * FROM unnest($1::bigint[], $2::bigint[], $3::timestamptz[])
+ON CONFLICT (guild_id, user_id)
+DO UPDATE SET last_message_at = GREATEST(member_activity.last_message_at, EXCLUDED.last_message_at);
+"""
+
+DEADCHAT_STATE_FETCH_SQL = """
+SELECT last_message_at, current_holder_user_id, last_award_at, last_award_message_id
+FROM deadchat_state
+WHERE guild_id = $1 AND channel_id = $2;
+"""
+
+DEADCHAT_CHECKPOINT_SQL = """
+INSERT INTO deadchat_state (guild_id, channel_id, last_message_at)
+SELECT * FROM unnest($1::bigint[], $2::bigint[], $3::timestamptz[])
+ON CONFLICT (guild_id, channel_id)
+DO UPDATE SET last_message_at = GREATEST(deadchat_state.last_message_at, EXCLUDED.last_message_at);
+"""
+
+MESSAGE_CONTEXT_SQL = """
+SELECT
+  EXISTS (SELECT 1 FROM activity_channels ac WHERE ac.guild_id = $1 AND ac.channel_id = $2) AS is_activity_channel,
+  dc.channel_id IS NOT NULL AS deadchat_configured, dc.enabled AS deadchat_enabled, dc.idle_minutes AS deadchat_idle_minutes,
+  sm.content AS sticky_content, sm.message_id AS sticky_message_id,
+  ad.delete_after_seconds, ad.log_channel_id
+FROM (SELECT 1) AS base
+LEFT JOIN deadchat_channels dc ON dc.guild_id = $1 AND dc.channel_id = $2
+LEFT JOIN sticky_messages sm ON sm.guild_id = $1 AND sm.channel_id = $2
+LEFT JOIN autodelete_channels ad ON ad.guild_id = $1 AND ad.channel_id = $2;
+"""
+
+# Statements on the message hot path with no-op arguments. Running each once when a pooled
+# connection opens puts it in asyncpg's per-connection statement cache, so the first real
+# message on that connection skips the parse/plan round trip.
+HOT_STATEMENTS = [
+    (SETTINGS_FETCH_SQL, (0,)),
+    (MESSAGE_CONTEXT_SQL, (0, 0)),
+    (ACTIVITY_UPSERT_SQL, ([], [], [])),
+    (DEADCHAT_STATE_FETCH_SQL, (0, 0)),
+    (DEADCHAT_CHECKPOINT_SQL, ([], [], [])),
+]
+
+async def _init_connection(conn: asyncpg.Connection) -> None:
+    await _prepare_hot_statements(conn)
+
+async def _prepare_hot_statements(conn: asyncpg.Connection) -> None:
+    if DB_STATEMENT_CACHE_SIZE <= 0:
+        return
+    for sql, args in HOT_STATEMENTS:
+        try:
+            await conn.execute(sql, *args)
+        except asyncpg.PostgresError:
+            # The pool opens before run_migrations, so on a fresh or older database the tables
+            # or columns may not exist yet; init_db warms again once the schema is current.
+            pass
+
+def db_pool_stats() -> dict:
+    if db_pool is None:
+        return {}
+    return {
+        "size": db_pool.get_size(),
+        "idle": db_pool.get_idle_size(),
+        "min": db_pool.get_min_size(),
+        "max": db_pool.get_max_size(),
+    }
+
+# -------- Schema migrations --------
+# Numbered, append-only. Each migration runs once in its own transaction and is recorded in
+# schema_migrations; boots against a current schema run no DDL at all. New schema changes get
+# a new number rather than an edit to an applied migration.
+MIGRATIONS = [
+    (1, "core tables", [
+        GUILD_SETTINGS_SQL,
+        SCHEMA_ALTERS_SQL,
+        MEMBER_ACTIVITY_SQL,
+        MEMBER_ACTIVITY_INDEX_SQL,
+        ACTIVITY_CHANNELS_SQL,
+        DEADCHAT_CHANNELS_SQL,
+        DEADCHAT_STATE_SQL,
+        DEADCHAT_COOLDOWNS_SQL,
+        PLAGUE_DAYS_SQL,
+        PLAGUE_DAILY_STATE_SQL,
+        PLAGUE_INFECTIONS_SQL,
+        PRIZE_DEFS_SQL,
+        PRIZE_SCHEDULES_SQL,
+        PRIZE_DROPS_SQL,
+        BIRTHDAYS_SQL,
+        BIRTHDAYS_INDEX_SQL,
+        BIRTHDAY_ANNOUNCE_LOG_SQL,
+        STICKY_MESSAGES_SQL,
+        AUTODELETE_CHANNELS_SQL,
+        AUTODELETE_IGNORE_PHRASES_SQL,
+        AUTODELETE_PENDING_SQL,
+        VOICE_ROLE_LINKS_SQL,
+        QOTD_HISTORY_SQL,
+        SCHEDULED_JOBS_SQL,
+    ], False),
+    (2, "movie tables", [
+        MOVIE_SETTINGS_SQL,
+        MOVIE_POOL_PICKS_SQL,
+        MOVIE_LIBRARY_ITEMS_SQL,
+        MOVIE_LIBRARY_MESSAGES_SQL,
+        MOVIE_NIGHT_HISTORY_SQL,
+    ], False),
+    # Optional: needs the pg_trgm extension to be installable. Recorded either way so it is
+    # not retried every boot; library autocomplete falls back to a prefix match without it.
+    (3, "movie library title trigram index", [MOVIE_LIBRARY_TRGM_SQL], True),
+]
+
+# Arbitrary constant so only one bot instance migrates at a time.
+SCHEMA_MIGRATIONS_LOCK_KEY = 727_001
+
+async def _applied_migrations(conn: asyncpg.Connection) -> set[int]:
+    if await conn.fetchval("SELECT to_regclass('schema_migrations')") is None:
+        return set()
+    return {int(r["version"]) for r in await conn.fetch("SELECT version FROM schema_migrations")}
+
+async def run_migrations(conn: asyncpg.Connection) -> list[int]:
+    """Apply pending migrations; returns the versions applied by this call."""
+    if {m[0] for m in MIGRATIONS} <= await _applied_migrations(conn):
+        return []
+    done = []
+    await conn.execute("SELECT pg_advisory_lock($1)", SCHEMA_MIGRATIONS_LOCK_KEY)
+    try:
+        await conn.execute(SCHEMA_MIGRATIONS_SQL)
+        # Another instance may have migrated while we waited for the lock.
+        applied = await _applied_migrations(conn)
+        for version, name, statements, optional in MIGRATIONS:
+            if version in applied:
+                continue
+            async with conn.transaction():
+                for sql in statements:
+                    if not optional:
+                        await conn.execute(sql)
+                        continue
+                    try:
+                        async with conn.transaction():
+                            await conn.execute(sql)
+                    except asyncpg.PostgresError:
+                        break
+                await conn.execute(
+                    "INSERT INTO schema_migrations (version, name) VALUES ($1, $2)",
+                    version, name,
+                )
+            done.append(version)
+    finally:
+        await conn.execute("SELECT pg_advisory_unlock($1)", SCHEMA_MIGRATIONS_LOCK_KEY)
+    return done
 
 async def init_db():
-    global db_pool
+    global db_pool, _pg_trgm_ok
     if not DATABASE_URL:
         raise RuntimeError("DATABASE_URL is missing")
-    db_pool = await asyncpg.create_pool(DATABASE_URL, min_size=1, max_size=10)
+    db_pool = await asyncpg.create_pool(
+        DATABASE_URL,
+        min_size=DB_POOL_MIN_SIZE,
+        max_size=DB_POOL_MAX_SIZE,
+        statement_cache_size=DB_STATEMENT_CACHE_SIZE,
+        init=_init_connection,
+        # A session-level SET would be undone by the pool's RESET ALL on release.
+        server_settings={"timezone": "UTC"},
+    )
     async with db_pool.acquire() as conn:
-        await conn.execute("SET TIME ZONE 'UTC';")
-        await conn.execute(GUILD_SETTINGS_SQL)
-        await conn.execute(SCHEMA_ALTERS_SQL)
-        await conn.execute(MEMBER_ACTIVITY_SQL)
-        await conn.execute(ACTIVITY_CHANNELS_SQL)
-        await conn.execute(DEADCHAT_CHANNELS_SQL)
-        await conn.execute(DEADCHAT_STATE_SQL)
-        await conn.execute(DEADCHAT_COOLDOWNS_SQL)
-        await conn.execute(PLAGUE_DAYS_SQL)
-        await conn.execute(PLAGUE_DAILY_STATE_SQL)
-        await conn.execute(PLAGUE_INFECTIONS_SQL)
-        await conn.execute(PRIZE_DEFS_SQL)
-        await conn.execute(PRIZE_SCHEDULES_SQL)
-        await conn.execute(PRIZE_DROPS_SQL)
-        await conn.execute(BIRTHDAYS_SQL)
-        await conn.execute(BIRTHDAY_ANNOUNCE_LOG_SQL)
-        await conn.execute(STICKY_MESSAGES_SQL)
-        await conn.execute(AUTODELETE_CHANNELS_SQL)
-        await conn.execute(AUTODELETE_IGNORE_PHRASES_SQL)
-        await conn.execute(VOICE_ROLE_LINKS_SQL)
-        await conn.execute(QOTD_HISTORY_SQL)
+        await run_migrations(conn)
+        _pg_trgm_ok = await conn.fetchval("SELECT to_regclass('idx_movie_library_items_title_trgm') IS NOT NULL")
+        await _prepare_hot_statements(conn)
 
 async def close_db():
     global db_pool
@@ -674,26 +1012,34 @@ def get_deadchat_lock(guild_id: int, channel_id: int) -> asyncio.Lock:
         deadchat_locks[key] = lock
     return lock
 
+_guild_rows_ensured: set[int] = set()
+_guild_settings_cache: dict[int, tuple[float, dict]] = {}
+guild_settings_cache_stats = {"hits": 0, "misses": 0}
+
+def invalidate_guild_settings(guild_id: int) -> None:
+    _guild_settings_cache.pop(int(guild_id), None)
+
 async def ensure_guild_row(guild_id: int) -> None:
+    if guild_id in _guild_rows_ensured:
+        return
     async with db_pool.acquire() as conn:
         await conn.execute("INSERT INTO guild_settings (guild_id) VALUES ($1) ON CONFLICT (guild_id) DO NOTHING;", guild_id)
+    _guild_rows_ensured.add(guild_id)
 
 async def get_guild_settings(guild_id: int) -> dict:
+    cached = _guild_settings_cache.get(guild_id)
+    if cached is not None and monotonic() - cached[0] < GUILD_SETTINGS_CACHE_TTL_SECONDS:
+        guild_settings_cache_stats["hits"] += 1
+        return dict(cached[1])
+    guild_settings_cache_stats["misses"] += 1
     await ensure_guild_row(guild_id)
     async with db_pool.acquire() as conn:
-        row = await conn.fetchrow(
-            """
-            SELECT active_role_id, active_threshold_minutes, active_mode,
-                   deadchat_role_id, deadchat_idle_minutes, deadchat_requires_active, deadchat_cooldown_minutes,
-                   plague_role_id, plague_duration_hours, plague_enabled, plague_scheduled_day,
-                   prizes_enabled,
-                   timezone
-            FROM guild_settings
-            WHERE guild_id = $1;
-            """,
-            guild_id,
-        )
-    return {
+        row = await conn.fetchrow(SETTINGS_FETCH_SQL, guild_id)
+    if row is None:
+        # Row was deleted outside the bot; recreate it on the next call.
+        _guild_rows_ensured.discard(guild_id)
+        return await get_guild_settings(guild_id)
+    settings = {
         "active_role_id": row["active_role_id"],
         "active_threshold_minutes": int(row["active_threshold_minutes"]),
         "active_mode": row["active_mode"] or "all",
@@ -703,9 +1049,13 @@ async def get_guild_settings(guild_id: int) -> dict:
         "deadchat_cooldown_minutes": int(row["deadchat_cooldown_minutes"]),
         "plague_role_id": row["plague_role_id"],
         "plague_duration_hours": int(row["plague_duration_hours"]),
+        "plague_enabled": bool(row["plague_enabled"]),
+        "plague_scheduled_day": row["plague_scheduled_day"],
         "prizes_enabled": bool(row["prizes_enabled"]),
         "timezone": row["timezone"] or "America/Los_Angeles",
     }
+    _guild_settings_cache[guild_id] = (monotonic(), settings)
+    return dict(settings)
 
 async def upsert_timezone(guild_id: int, timezone: str) -> None:
     await ensure_guild_row(guild_id)
@@ -720,6 +1070,9 @@ async def upsert_timezone(guild_id: int, timezone: str) -> None:
             guild_id,
             timezone,
         )
+    invalidate_guild_settings(guild_id)
+    await scheduler_ensure_daily_jobs(guild_id)
+
 
 async def set_active_role(guild_id: int, role_id: int | None) -> None:
     await ensure_guild_row(guild_id)
@@ -734,6 +1087,12 @@ async def set_active_role(guild_id: int, role_id: int | None) -> None:
             guild_id,
             role_id,
         )
+    invalidate_guild_settings(guild_id)
+    _active_sweep_cutoff.pop(guild_id, None)
+    _active_sweep_carry.pop(guild_id, None)
+    _active_role_holders.pop(guild_id, None)
+    await schedule_job("active_sweep", f"active_sweep:{guild_id}", now_utc(), {"guild_id": guild_id})
+
 
 async def set_active_threshold(guild_id: int, minutes: int) -> None:
     await ensure_guild_row(guild_id)
@@ -748,6 +1107,9 @@ async def set_active_threshold(guild_id: int, minutes: int) -> None:
             guild_id,
             minutes,
         )
+    invalidate_guild_settings(guild_id)
+    await schedule_job("active_sweep", f"active_sweep:{guild_id}", now_utc(), {"guild_id": guild_id})
+
 
 async def set_active_mode(guild_id: int, mode: str) -> None:
     mode = mode.lower().strip()
@@ -765,6 +1127,7 @@ async def set_active_mode(guild_id: int, mode: str) -> None:
             guild_id,
             mode,
         )
+    invalidate_guild_settings(guild_id)
 
 async def add_activity_channel(guild_id: int, channel_id: int) -> None:
     async with db_pool.acquire() as conn:
@@ -779,85 +1142,266 @@ async def list_activity_channels(guild_id: int) -> list[int]:
         rows = await conn.fetch("SELECT channel_id FROM activity_channels WHERE guild_id = $1 ORDER BY channel_id ASC;", guild_id)
     return [int(r["channel_id"]) for r in rows]
 
+# Write-behind buffer: (guild_id, user_id) -> last_message_at, flushed by activity_flush_loop
+_activity_dirty: dict[tuple[int, int], datetime] = {}
+
 async def record_activity(guild_id: int, user_id: int) -> None:
-    async with db_pool.acquire() as conn:
-        await conn.execute(
-            """
-            INSERT INTO member_activity (guild_id, user_id, last_message_at)
-            VALUES ($1, $2, NOW())
-            ON CONFLICT (guild_id, user_id)
-            DO UPDATE SET last_message_at = NOW();
-            """,
-            guild_id,
-            user_id,
-        )
+    _activity_dirty[(guild_id, user_id)] = now_utc()
+
+async def flush_activity() -> int:
+    global _activity_dirty
+    if not _activity_dirty or db_pool is None:
+        return 0
+    batch, _activity_dirty = _activity_dirty, {}
+    keys = list(batch.keys())
+    try:
+        async with db_pool.acquire() as conn:
+            await conn.execute(
+                ACTIVITY_UPSERT_SQL,
+                [k[0] for k in keys],
+                [k[1] for k in keys],
+                [batch[k] for k in keys],
+            )
+    except Exception:
+        # Put the batch back unless a newer message already replaced the entry.
+        for k, ts in batch.items():
+            cur = _activity_dirty.get(k)
+            if cur is None or cur < ts:
+                _activity_dirty[k] = ts
+        raise
+    return len(batch)
+
+# -------- Role operation queue --------
+# Pending role changes per (guild_id, user_id): role_id -> (add, reason). A later op on the
+# same role replaces the earlier one, so a voice join followed by a leave nets out before
+# anything reaches Discord. Each member key sits in the queue at most once, and never while
+# a worker is applying it: ops that arrive mid-apply wait and the key is re-queued afterwards,
+# so two workers can't edit the same member from stale role lists.
+_role_pending: dict[tuple[int, int], dict[int, tuple[bool, str]]] = {}
+_role_inflight: set[tuple[int, int]] = set()
+_role_queue: asyncio.Queue = asyncio.Queue()
+_role_buckets: dict[int, list[float]] = {}
+role_queue_stats = {"queued": 0, "coalesced": 0, "api_calls": 0, "failed": 0}
+
+def queue_role_change(member: discord.Member, role: discord.Role, add: bool, reason: str) -> None:
+    key = (int(member.guild.id), int(member.id))
+    pending = _role_pending.get(key)
+    if pending is None:
+        pending = {}
+        _role_pending[key] = pending
+        if key not in _role_inflight:
+            _role_queue.put_nowait(key)
+    elif int(role.id) in pending:
+        role_queue_stats["coalesced"] += 1
+    pending[int(role.id)] = (add, reason)
+    role_queue_stats["queued"] += 1
+
+def _role_bucket_delay(guild_id: int) -> float:
+    """Take a token from the guild's bucket; return how long to wait if none is available."""
+    now = monotonic()
+    bucket = _role_buckets.get(guild_id)
+    if bucket is None:
+        bucket = [ROLE_QUEUE_GUILD_BURST, now]
+        _role_buckets[guild_id] = bucket
+    bucket[0] = min(ROLE_QUEUE_GUILD_BURST, bucket[0] + (now - bucket[1]) * ROLE_QUEUE_GUILD_RATE)
+    bucket[1] = now
+    if bucket[0] >= 1:
+        bucket[0] -= 1
+        return 0.0
+    return (1 - bucket[0]) / ROLE_QUEUE_GUILD_RATE
+
+async def _role_apply(bot: commands.Bot, key: tuple[int, int], ops: dict[int, tuple[bool, str]]) -> None:
+    guild_id, user_id = key
+    guild = bot.get_guild(guild_id)
+    member = guild.get_member(user_id) if guild else None
+    if member is None:
+        return
+    current = {int(r.id): r for r in member.roles}
+    adds = []
+    removes = []
+    reasons = []
+    for role_id, (add, reason) in ops.items():
+        if add and role_id not in current:
+            role = guild.get_role(role_id)
+            if role is not None:
+                adds.append(role)
+                reasons.append(reason)
+        elif not add and role_id in current:
+            removes.append(current[role_id])
+            reasons.append(reason)
+    if not adds and not removes:
+        return
+    reason = "; ".join(dict.fromkeys(reasons))
+    role_queue_stats["api_calls"] += 1
+    try:
+        if len(adds) + len(removes) > 1:
+            keep = [r for r in current.values() if r not in removes and not r.is_default()]
+            await member.edit(roles=keep + adds, reason=reason)
+        elif adds:
+            await member.add_roles(adds[0], reason=reason)
+        else:
+            await member.remove_roles(removes[0], reason=reason)
+    except Exception as e:
+        role_queue_stats["failed"] += 1
+        print(f"⚠️ Role queue: update for member {user_id} in guild {guild_id} failed: {e!r}")
+        for role_id in ops:
+            active_role_holders_update(guild_id, role_id, user_id, role_id in current)
+        return
+    for role_id, (add, _) in ops.items():
+        active_role_holders_update(guild_id, role_id, user_id, add)
 
-async def should_count_activity_message(guild_id: int, channel_id: int) -> bool:
-    settings = await get_guild_settings(guild_id)
-    if settings["active_mode"] == "all":
-        return True
-    async with db_pool.acquire() as conn:
-        exists = await conn.fetchval("SELECT 1 FROM activity_channels WHERE guild_id = $1 AND channel_id = $2;", guild_id, channel_id)
-    return bool(exists)
+async def role_queue_worker(bot: commands.Bot) -> None:
+    loop = asyncio.get_running_loop()
+    while True:
+        key = await _role_queue.get()
+        delay = _role_bucket_delay(key[0])
+        if delay > 0:
+            # Out of tokens for this guild: park the key and keep serving other guilds.
+            loop.call_later(delay, _role_queue.put_nowait, key)
+            continue
+        ops = _role_pending.pop(key, None)
+        if not ops:
+            continue
+        _role_inflight.add(key)
+        try:
+            await _role_apply(bot, key, ops)
+        except Exception as e:
+            print(f"⚠️ Role queue: applying {key} raised {e!r}")
+        finally:
+            _role_inflight.discard(key)
+            if key in _role_pending:
+                _role_queue.put_nowait(key)
+
+def role_queue_start(bot: commands.Bot) -> None:
+    global role_queue_tasks
+    if role_queue_tasks:
+        return
+    role_queue_tasks = [asyncio.create_task(role_queue_worker(bot)) for _ in range(max(1, ROLE_QUEUE_WORKERS))]
+
+# Per guild, (active role id, user ids known to hold it). Built from the role's member list on
+# first use and kept current by on_member_update and the bot's own add/remove calls.
+_active_role_holders: dict[int, tuple[int, set[int]]] = {}
 
-async def maybe_apply_active_role(member: discord.Member) -> None:
-    settings = await get_guild_settings(member.guild.id)
+def active_role_holders(guild: discord.Guild, role: discord.Role) -> set[int]:
+    entry = _active_role_holders.get(int(guild.id))
+    if entry is None or entry[0] != int(role.id):
+        entry = (int(role.id), {int(m.id) for m in role.members})
+        _active_role_holders[int(guild.id)] = entry
+    return entry[1]
+
+def active_role_holders_update(guild_id: int, role_id: int, user_id: int, has_role: bool) -> None:
+    entry = _active_role_holders.get(guild_id)
+    if entry is None or entry[0] != role_id:
+        return
+    if has_role:
+        entry[1].add(user_id)
+    else:
+        entry[1].discard(user_id)
+
+async def maybe_apply_active_role(member: discord.Member, settings: dict | None = None) -> None:
+    entry = _active_role_holders.get(int(member.guild.id))
+    if entry is not None and int(member.id) in entry[1]:
+        return
+    if settings is None:
+        settings = await get_guild_settings(member.guild.id)
     role_id = settings["active_role_id"]
     if not role_id:
         return
     role = member.guild.get_role(int(role_id))
     if role is None:
         return
+    holders = active_role_holders(member.guild, role)
+    holders.add(int(member.id))
     if role in member.roles:
         return
-    try:
-        await member.add_roles(role, reason="Activity Tracking: member became active")
-    except Exception:
-        return
-
-async def active_cleanup_once(bot: commands.Bot):
-    if db_pool is None:
-        return
+    queue_role_change(member, role, True, "Activity Tracking: member became active")
+
+# Per guild, the stale cutoff used by the previous sweep. member_activity rows whose
+# last_message_at falls between that cutoff and the new one are exactly the members whose
+# active role expired in between, so a sweep is one range scan on idx_member_activity_guild_last.
+# Members in a swept range that could not be handled (not cached while the member cache is
+# incomplete) are carried into the next sweep until found or gone, and every
+# ACTIVE_FULL_SWEEP_SECONDS the sweep re-checks all role holders so a removal that failed in
+# the role queue is retried.
+_active_sweep_cutoff: dict[int, datetime] = {}
+_active_sweep_carry: dict[int, set[int]] = {}
+_active_full_sweep_at: dict[int, float] = {}
+
+async def active_cleanup_guild(bot: commands.Bot, guild_id: int) -> datetime | None:
+    """Remove the active role from members that expired since the last sweep and return when the next one can expire."""
+    settings = await get_guild_settings(guild_id)
+    role_id = settings["active_role_id"]
+    if not role_id:
+        _active_sweep_cutoff.pop(guild_id, None)
+        _active_sweep_carry.pop(guild_id, None)
+        return None
+    threshold = timedelta(minutes=int(settings["active_threshold_minutes"]))
+    guild = bot.get_guild(guild_id)
+    role = guild.get_role(int(role_id)) if guild else None
+    await flush_activity()
+    cutoff = now_utc() - threshold
+    prev_cutoff = _active_sweep_cutoff.get(guild_id)
+    full = prev_cutoff is None or monotonic() - _active_full_sweep_at.get(guild_id, 0.0) >= ACTIVE_FULL_SWEEP_SECONDS
+    carry = list(_active_sweep_carry.get(guild_id, ()))
     async with db_pool.acquire() as conn:
-        rows = await conn.fetch(
-            """
-            SELECT guild_id, active_role_id, active_threshold_minutes
-            FROM guild_settings
-            WHERE active_role_id IS NOT NULL;
-            """
-        )
-    for r in rows:
-        guild_id = int(r["guild_id"])
-        role_id = int(r["active_role_id"])
-        threshold_minutes = int(r["active_threshold_minutes"])
-        guild = bot.get_guild(guild_id)
-        if guild is None:
-            continue
-        role = guild.get_role(role_id)
         if role is None:
-            continue
-        async with db_pool.acquire() as conn:
-            stale = await conn.fetch(
+            expired = []
+        elif full:
+            # First sweep since startup, and periodically after: look at all current role holders.
+            expired = await conn.fetch(
                 """
                 SELECT user_id
                 FROM member_activity
-                WHERE guild_id = $1
-                  AND last_message_at < (NOW() - ($2::int * INTERVAL '1 minute'));
+                WHERE guild_id = $1 AND user_id = ANY($2::bigint[]) AND last_message_at < $3;
                 """,
                 guild_id,
-                threshold_minutes,
+                list({int(m.id) for m in role.members} | set(carry)),
+                cutoff,
             )
-        for s in stale:
+        else:
+            expired = await conn.fetch(
+                """
+                SELECT user_id
+                FROM member_activity
+                WHERE guild_id = $1 AND last_message_at >= $2 AND last_message_at < $3
+                UNION
+                SELECT user_id
+                FROM member_activity
+                WHERE guild_id = $1 AND user_id = ANY($4::bigint[]) AND last_message_at < $3;
+                """,
+                guild_id,
+                prev_cutoff,
+                cutoff,
+                carry,
+            )
+        next_last = await conn.fetchval(
+            "SELECT MIN(last_message_at) FROM member_activity WHERE guild_id = $1 AND last_message_at >= $2;",
+            guild_id,
+            cutoff,
+        )
+    if role is not None:
+        _active_sweep_cutoff[guild_id] = cutoff
+        if full:
+            _active_full_sweep_at[guild_id] = monotonic()
+        skipped = set()
+        for s in expired:
             user_id = int(s["user_id"])
+            if (guild_id, user_id) in _activity_dirty:
+                # Active again; the buffered timestamp puts them back ahead of the cutoff.
+                continue
             member = guild.get_member(user_id)
             if member is None:
+                # With a complete member cache a miss means they left; only carry otherwise.
+                if not guild.chunked:
+                    skipped.add(user_id)
                 continue
             if role not in member.roles:
                 continue
-            try:
-                await member.remove_roles(role, reason="Activity Tracking: inactivity threshold exceeded")
-            except Exception:
-                continue
+            queue_role_change(member, role, False, "Activity Tracking: inactivity threshold exceeded")
+        _active_sweep_carry[guild_id] = skipped
+    if next_last is None:
+        return now_utc() + threshold
+    return next_last + threshold
 
 async def set_deadchat_role(guild_id: int, role_id: int | None) -> None:
     await ensure_guild_row(guild_id)
@@ -872,6 +1416,7 @@ async def set_deadchat_role(guild_id: int, role_id: int | None) -> None:
             guild_id,
             role_id,
         )
+    invalidate_guild_settings(guild_id)
 
 async def set_deadchat_idle(guild_id: int, minutes: int) -> None:
     await ensure_guild_row(guild_id)
@@ -886,6 +1431,7 @@ async def set_deadchat_idle(guild_id: int, minutes: int) -> None:
             guild_id,
             minutes,
         )
+    invalidate_guild_settings(guild_id)
 
 async def set_deadchat_cooldown(guild_id: int, minutes: int) -> None:
     await ensure_guild_row(guild_id)
@@ -900,6 +1446,7 @@ async def set_deadchat_cooldown(guild_id: int, minutes: int) -> None:
             guild_id,
             minutes,
         )
+    invalidate_guild_settings(guild_id)
 
 async def set_deadchat_requires_active(guild_id: int, enabled: bool) -> None:
     await ensure_guild_row(guild_id)
@@ -914,6 +1461,7 @@ async def set_deadchat_requires_active(guild_id: int, enabled: bool) -> None:
             guild_id,
             enabled,
         )
+    invalidate_guild_settings(guild_id)
 
 async def add_deadchat_channel(guild_id: int, channel_id: int, idle_minutes_override: int | None) -> None:
     async with db_pool.acquire() as conn:
@@ -928,19 +1476,23 @@ async def add_deadchat_channel(guild_id: int, channel_id: int, idle_minutes_over
             channel_id,
             idle_minutes_override,
         )
+        # Messages in unconfigured channels aren't tracked, so whatever state is left from an
+        # earlier stint is stale; restart the idle clock rather than award on the first message.
         await conn.execute(
             """
             INSERT INTO deadchat_state (guild_id, channel_id, last_message_at)
             VALUES ($1, $2, NOW())
-            ON CONFLICT (guild_id, channel_id) DO NOTHING;
+            ON CONFLICT (guild_id, channel_id) DO UPDATE SET last_message_at = NOW();
             """,
             guild_id,
             channel_id,
         )
+    deadchat_forget_state(guild_id, channel_id)
 
 async def remove_deadchat_channel(guild_id: int, channel_id: int) -> None:
     async with db_pool.acquire() as conn:
         await conn.execute("DELETE FROM deadchat_channels WHERE guild_id = $1 AND channel_id = $2;", guild_id, channel_id)
+    deadchat_forget_state(guild_id, channel_id)
 
 async def list_deadchat_channels(guild_id: int) -> list[dict]:
     async with db_pool.acquire() as conn:
@@ -955,45 +1507,53 @@ async def list_deadchat_channels(guild_id: int) -> list[dict]:
         )
     return [{"channel_id": int(r["channel_id"]), "enabled": bool(r["enabled"]), "idle_minutes": r["idle_minutes"]} for r in rows]
 
-async def get_deadchat_channel_config(guild_id: int, channel_id: int) -> dict | None:
-    async with db_pool.acquire() as conn:
-        row = await conn.fetchrow(
-            """
-            SELECT enabled, idle_minutes
-            FROM deadchat_channels
-            WHERE guild_id = $1 AND channel_id = $2;
-            """,
-            guild_id,
-            channel_id,
-        )
-    if not row:
-        return None
-    return {"enabled": bool(row["enabled"]), "idle_minutes": row["idle_minutes"]}
+# Live deadchat state per (guild_id, channel_id). Hydrated lazily from deadchat_state;
+# last_message_at is checkpointed by deadchat_checkpoint_loop, awards are written immediately.
+_deadchat_state: dict[tuple[int, int], dict] = {}
+_deadchat_state_dirty: set[tuple[int, int]] = set()
 
-async def deadchat_update_last_message(guild_id: int, channel_id: int) -> None:
-    async with db_pool.acquire() as conn:
-        await conn.execute(
-            """
-            INSERT INTO deadchat_state (guild_id, channel_id, last_message_at)
-            VALUES ($1, $2, NOW())
-            ON CONFLICT (guild_id, channel_id)
-            DO UPDATE SET last_message_at = NOW();
-            """,
-            guild_id,
-            channel_id,
-        )
+async def deadchat_load_state(guild_id: int, channel_id: int) -> dict:
+    key = (guild_id, channel_id)
+    state = _deadchat_state.get(key)
+    if state is None:
+        loaded = await deadchat_get_state(guild_id, channel_id)
+        state = _deadchat_state.setdefault(key, loaded)
+    return state
+
+def deadchat_forget_state(guild_id: int, channel_id: int) -> None:
+    """Drop the cached state (and any pending checkpoint) so the next load reads deadchat_state."""
+    _deadchat_state.pop((guild_id, channel_id), None)
+    _deadchat_state_dirty.discard((guild_id, channel_id))
+
+def deadchat_touch(guild_id: int, channel_id: int, when: datetime) -> None:
+    key = (guild_id, channel_id)
+    state = _deadchat_state.get(key)
+    if state is None:
+        return
+    state["last_message_at"] = when
+    _deadchat_state_dirty.add(key)
+
+async def deadchat_checkpoint() -> int:
+    global _deadchat_state_dirty
+    if not _deadchat_state_dirty or db_pool is None:
+        return 0
+    keys, _deadchat_state_dirty = list(_deadchat_state_dirty), set()
+    try:
+        async with db_pool.acquire() as conn:
+            await conn.execute(
+                DEADCHAT_CHECKPOINT_SQL,
+                [k[0] for k in keys],
+                [k[1] for k in keys],
+                [_deadchat_state[k]["last_message_at"] for k in keys],
+            )
+    except Exception:
+        _deadchat_state_dirty.update(keys)
+        raise
+    return len(keys)
 
 async def deadchat_get_state(guild_id: int, channel_id: int) -> dict:
     async with db_pool.acquire() as conn:
-        row = await conn.fetchrow(
-            """
-            SELECT last_message_at, current_holder_user_id, last_award_at, last_award_message_id
-            FROM deadchat_state
-            WHERE guild_id = $1 AND channel_id = $2;
-            """,
-            guild_id,
-            channel_id,
-        )
+        row = await conn.fetchrow(DEADCHAT_STATE_FETCH_SQL, guild_id, channel_id)
     if not row:
         return {"last_message_at": now_utc(), "current_holder_user_id": None, "last_award_at": None, "last_award_message_id": None}
     return {
@@ -1063,6 +1623,7 @@ async def plague_set_role(guild_id: int, role_id: int | None) -> None:
             guild_id,
             role_id,
         )
+    invalidate_guild_settings(guild_id)
 
 async def plague_set_duration(guild_id: int, hours: int) -> None:
     await ensure_guild_row(guild_id)
@@ -1077,6 +1638,7 @@ async def plague_set_duration(guild_id: int, hours: int) -> None:
             guild_id,
             hours,
         )
+    invalidate_guild_settings(guild_id)
 
 
 async def plague_set_enabled(guild_id: int, enabled: bool) -> None:
@@ -1092,6 +1654,7 @@ async def plague_set_enabled(guild_id: int, enabled: bool) -> None:
             guild_id,
             enabled,
         )
+    invalidate_guild_settings(guild_id)
 
 async def plague_set_scheduled_day(guild_id: int, day: date | None) -> None:
     await ensure_guild_row(guild_id)
@@ -1106,6 +1669,7 @@ async def plague_set_scheduled_day(guild_id: int, day: date | None) -> None:
             guild_id,
             day,
         )
+    invalidate_guild_settings(guild_id)
 
 async def plague_add_day(guild_id: int, day: date) -> None:
     async with db_pool.acquire() as conn:
@@ -1167,11 +1731,6 @@ async def plague_add_infection(guild_id: int, user_id: int, expires_at: datetime
             source_channel_id,
         )
 
-async def plague_get_expired() -> list[dict]:
-    async with db_pool.acquire() as conn:
-        rows = await conn.fetch("SELECT guild_id, user_id FROM plague_infections WHERE expires_at <= NOW();")
-    return [{"guild_id": int(r["guild_id"]), "user_id": int(r["user_id"])} for r in rows]
-
 async def plague_delete_infection(guild_id: int, user_id: int) -> None:
     async with db_pool.acquire() as conn:
         await conn.execute("DELETE FROM plague_infections WHERE guild_id = $1 AND user_id = $2;", guild_id, user_id)
@@ -1189,6 +1748,7 @@ async def prize_set_enabled(guild_id: int, enabled: bool) -> None:
             guild_id,
             enabled,
         )
+    invalidate_guild_settings(guild_id)
 
 async def prize_set_drop_channel(guild_id: int, channel_id: int | None) -> None:
     await ensure_guild_row(guild_id)
@@ -1198,6 +1758,7 @@ async def prize_set_drop_channel(guild_id: int, channel_id: int | None) -> None:
             guild_id,
             channel_id,
         )
+    invalidate_guild_settings(guild_id)
 
 async def prize_set_winner_announce_channel(guild_id: int, channel_id: int | None) -> None:
     await ensure_guild_row(guild_id)
@@ -1207,6 +1768,7 @@ async def prize_set_winner_announce_channel(guild_id: int, channel_id: int | Non
             guild_id,
             channel_id,
         )
+    invalidate_guild_settings(guild_id)
 
 async def prize_add_definition(guild_id: int, title: str, description: str | None, image_url: str | None) -> uuid.UUID:
     pid = uuid.uuid4()
@@ -1222,11 +1784,13 @@ async def prize_add_definition(guild_id: int, title: str, description: str | Non
             description,
             image_url,
         )
+    title_index_invalidate("prize", guild_id)
     return pid
 
 async def prize_delete_definition(guild_id: int, prize_id: uuid.UUID) -> None:
     async with db_pool.acquire() as conn:
         await conn.execute("DELETE FROM prize_definitions WHERE guild_id = $1 AND prize_id = $2;", guild_id, prize_id)
+    title_index_invalidate("prize", guild_id)
 
 async def prize_list_definitions(guild_id: int, limit: int = 25) -> list[dict]:
     async with db_pool.acquire() as conn:
@@ -1243,23 +1807,6 @@ async def prize_list_definitions(guild_id: int, limit: int = 25) -> list[dict]:
         )
     return [{"prize_id": r["prize_id"], "title": r["title"], "enabled": bool(r["enabled"])} for r in rows]
 
-async def prize_find_definitions(guild_id: int, query: str, limit: int = 25) -> list[dict]:
-    q = (query or "").strip()
-    async with db_pool.acquire() as conn:
-        rows = await conn.fetch(
-            """
-            SELECT prize_id, title, enabled
-            FROM prize_definitions
-            WHERE guild_id = $1 AND title ILIKE $2
-            ORDER BY title ASC
-            LIMIT $3;
-            """,
-            guild_id,
-            f"%{q}%",
-            limit,
-        )
-    return [{"prize_id": r["prize_id"], "title": r["title"], "enabled": bool(r["enabled"])} for r in rows]
-
 async def prize_get_definition(guild_id: int, prize_id: uuid.UUID) -> dict | None:
     async with db_pool.acquire() as conn:
         row = await conn.fetchrow(
@@ -1402,38 +1949,29 @@ async def prize_get_drop(guild_id: int, drop_id: uuid.UUID) -> dict | None:
         "claimed_at": row["claimed_at"],
     }
 
-async def deadchat_is_configured(guild_id: int, channel_id: int) -> bool:
-    async with db_pool.acquire() as conn:
-        value = await conn.fetchval(
-            "SELECT 1 FROM deadchat_channels WHERE guild_id = $1 AND channel_id = $2 AND enabled = TRUE;",
-            guild_id,
-            channel_id,
-        )
-    return bool(value)
-
-async def deadchat_attempt_award(bot: commands.Bot, message: discord.Message) -> None:
+async def deadchat_attempt_award(bot: commands.Bot, message: discord.Message, ctx: dict | None = None) -> None:
     if message.guild is None:
         return
     if not isinstance(message.author, discord.Member):
         return
     guild_id = int(message.guild.id)
     channel_id = int(message.channel.id)
-    cfg = await get_deadchat_channel_config(guild_id, channel_id)
-    if not cfg or not cfg["enabled"]:
-        await deadchat_update_last_message(guild_id, channel_id)
+    if ctx is None:
+        ctx = await load_message_context(guild_id, channel_id)
+    cfg = ctx["deadchat"]
+    settings = ctx["settings"]
+    if not cfg:
         return
-    settings = await get_guild_settings(guild_id)
+    state = await deadchat_load_state(guild_id, channel_id)
+    now = now_utc()
+    last_msg_at = state["last_message_at"]
+    deadchat_touch(guild_id, channel_id, now)
     role_id = settings["deadchat_role_id"]
-    if not role_id:
-        await deadchat_update_last_message(guild_id, channel_id)
+    if not cfg["enabled"] or not role_id:
         return
-    state = await deadchat_get_state(guild_id, channel_id)
     idle_minutes = int(cfg["idle_minutes"]) if cfg["idle_minutes"] is not None else int(settings["deadchat_idle_minutes"])
-    last_msg_at = state["last_message_at"]
-    now = now_utc()
-    is_dead = (now - last_msg_at) >= timedelta(minutes=idle_minutes)
-    await deadchat_update_last_message(guild_id, channel_id)
-    if not is_dead:
+    # Check-and-touch happens without an await in between, so only the first message after the idle window sees a dead channel.
+    if (now - last_msg_at) < timedelta(minutes=idle_minutes):
         return
     if settings["deadchat_requires_active"]:
         active_role_id = settings["active_role_id"]
@@ -1441,18 +1979,8 @@ async def deadchat_attempt_award(bot: commands.Bot, message: discord.Message) ->
             active_role = message.guild.get_role(int(active_role_id))
             if active_role and active_role not in message.author.roles:
                 return
-    cooldown_until = await deadchat_get_user_cooldown_until(guild_id, channel_id, int(message.author.id))
-    if cooldown_until and cooldown_until > now:
-        return
     lock = get_deadchat_lock(guild_id, channel_id)
     async with lock:
-        state = await deadchat_get_state(guild_id, channel_id)
-        last_msg_at = state["last_message_at"]
-        now = now_utc()
-        is_dead = (now - last_msg_at) >= timedelta(minutes=idle_minutes)
-        await deadchat_update_last_message(guild_id, channel_id)
-        if not is_dead:
-            return
         cooldown_until = await deadchat_get_user_cooldown_until(guild_id, channel_id, int(message.author.id))
         if cooldown_until and cooldown_until > now:
             return
@@ -1462,16 +1990,9 @@ async def deadchat_attempt_award(bot: commands.Bot, message: discord.Message) ->
         prev_holder_id = state["current_holder_user_id"]
         if prev_holder_id:
             prev_member = message.guild.get_member(int(prev_holder_id))
-            if prev_member and deadchat_role in prev_member.roles:
-                try:
-                    await prev_member.remove_roles(deadchat_role, reason="Dead Chat: transferred to new holder")
-                except Exception:
-                    pass
-        if deadchat_role not in message.author.roles:
-            try:
-                await message.author.add_roles(deadchat_role, reason="Dead Chat: awarded to channel reviver")
-            except Exception:
-                return
+            if prev_member and int(prev_member.id) != int(message.author.id):
+                queue_role_change(prev_member, deadchat_role, False, "Dead Chat: transferred to new holder")
+        queue_role_change(message.author, deadchat_role, True, "Dead Chat: awarded to channel reviver")
         old_msg_id = state["last_award_message_id"]
         if old_msg_id:
             try:
@@ -1481,12 +2002,14 @@ async def deadchat_attempt_award(bot: commands.Bot, message: discord.Message) ->
                 pass
         text = MSG["deadchat_awarded"]
         text = format_template(text, message.author)
-        sent = await message.channel.send(text)
         try:
-            sent = await message.channel.send(announce_text)
+            sent = await message.channel.send(text)
         except Exception:
             sent = None
         await deadchat_set_holder(guild_id, channel_id, int(message.author.id), int(sent.id) if sent else None)
+        state["current_holder_user_id"] = int(message.author.id)
+        state["last_award_at"] = now
+        state["last_award_message_id"] = int(sent.id) if sent else None
         cd_minutes = int(settings["deadchat_cooldown_minutes"])
         if cd_minutes > 0:
             await deadchat_set_user_cooldown(guild_id, channel_id, int(message.author.id), now + timedelta(minutes=cd_minutes))
@@ -1525,12 +2048,15 @@ async def maybe_trigger_plague(guild: discord.Guild, winner_user_id: int, source
 
     expires_at = utc_now + timedelta(days=3)
 
-    try:
-        await member.add_roles(role, reason="Plague Day: first Dead Chat winner after 12:00 UTC")
-    except Exception:
-        return
+    queue_role_change(member, role, True, "Plague Day: first Dead Chat winner after 12:00 UTC")
 
     await plague_add_infection(int(guild.id), winner_user_id, expires_at, source_channel_id)
+    await schedule_job(
+        "plague_expire",
+        f"plague_expire:{int(guild.id)}:{winner_user_id}",
+        expires_at,
+        {"guild_id": int(guild.id), "user_id": winner_user_id},
+    )
     await plague_mark_triggered(int(guild.id), scheduled_day, winner_user_id)
 
     channel = guild.get_channel(int(source_channel_id))
@@ -1577,26 +2103,30 @@ async def maybe_trigger_prize_drop(guild: discord.Guild, winner_user_id: int) ->
     except Exception:
         pass
 
-async def plague_cleanup_once(bot: commands.Bot):
-    expired = await plague_get_expired()
-    for e in expired:
-        guild = bot.get_guild(int(e["guild_id"]))
-        if guild is None:
-            await plague_delete_infection(int(e["guild_id"]), int(e["user_id"]))
-            continue
-        settings = await get_guild_settings(int(guild.id))
+async def plague_expire_job(bot: commands.Bot, payload: dict) -> None:
+    guild_id = int(payload["guild_id"])
+    user_id = int(payload["user_id"])
+    async with db_pool.acquire() as conn:
+        expires_at = await conn.fetchval(
+            "SELECT expires_at FROM plague_infections WHERE guild_id = $1 AND user_id = $2;",
+            guild_id,
+            user_id,
+        )
+    if expires_at is None:
+        return
+    if expires_at > now_utc():
+        # Re-infected since this job was queued
+        await schedule_job("plague_expire", f"plague_expire:{guild_id}:{user_id}", expires_at, payload)
+        return
+    guild = bot.get_guild(guild_id)
+    if guild is not None:
+        settings = await get_guild_settings(guild_id)
         role_id = settings["plague_role_id"]
-        if role_id:
-            role = guild.get_role(int(role_id))
-        else:
-            role = None
-        member = guild.get_member(int(e["user_id"]))
-        if member and role and role in member.roles:
-            try:
-                await member.remove_roles(role, reason="Plague: infection expired")
-            except Exception:
-                pass
-        await plague_delete_infection(int(guild.id), int(e["user_id"]))
+        role = guild.get_role(int(role_id)) if role_id else None
+        member = guild.get_member(user_id)
+        if member and role:
+            queue_role_change(member, role, False, "Plague: infection expired")
+    await plague_delete_infection(guild_id, user_id)
 
 ############### VIEWS / UI COMPONENTS ###############
 class PrizeClaimView(discord.ui.View):
@@ -1635,6 +2165,170 @@ class PrizeClaimView(discord.ui.View):
             pass
 
 ############### AUTOCOMPLETE FUNCTIONS ###############
+# -------- Title autocomplete --------
+# Per-guild in-memory trigram indexes over prize titles, pool picks and library titles so
+# keystroke-rate autocomplete never hits the database. Writers call title_index_invalidate.
+_title_indexes: dict[tuple[str, int], dict] = {}
+_pg_trgm_ok: bool = False
+
+def _trigrams(text: str) -> set[str]:
+    """pg_trgm-style trigrams: each word padded with two leading and one trailing space."""
+    grams = set()
+    for word in re.findall(r"\w+", text.lower()):
+        w = f"  {word} "
+        for i in range(len(w) - 2):
+            grams.add(w[i:i + 3])
+    return grams
+
+def title_index_build(entries: list[tuple[str, str, int | None]]) -> dict:
+    """entries are (title, choice value, owner id or None)."""
+    entries = sorted(entries, key=lambda e: e[0].lower())
+    idx = {
+        "names": [e[0] for e in entries],
+        "values": [e[1] for e in entries],
+        "owners": [e[2] for e in entries],
+        "lower": [e[0].lower() for e in entries],
+        "sizes": [],
+        "grams": {},
+    }
+    for i, name in enumerate(idx["names"]):
+        grams = _trigrams(name)
+        idx["sizes"].append(len(grams))
+        for g in grams:
+            idx["grams"].setdefault(g, []).append(i)
+    return idx
+
+def title_index_search(idx: dict, query: str, limit: int = 25, owner: int | None = None) -> list[int]:
+    q = " ".join((query or "").lower().split())
+    owners = idx["owners"]
+    if not q:
+        return [i for i in range(len(owners)) if owner is None or owners[i] == owner][:limit]
+    lower = idx["lower"]
+    scores: dict[int, float] = {}
+    grams = _trigrams(q)
+    if grams:
+        hits: dict[int, int] = {}
+        for g in grams:
+            for i in idx["grams"].get(g, ()):
+                hits[i] = hits.get(i, 0) + 1
+        sizes = idx["sizes"]
+        for i, n in hits.items():
+            sim = n / (len(grams) + sizes[i] - n)
+            if sim >= 0.1:
+                scores[i] = sim
+    if len(q) < 3 or not scores:
+        # Short queries carry too few trigrams to rank; fall back to a substring scan.
+        for i, name in enumerate(lower):
+            if q in name:
+                scores.setdefault(i, 0.0)
+    ranked = []
+    for i, sim in scores.items():
+        if owner is not None and owners[i] != owner:
+            continue
+        if lower[i].startswith(q):
+            sim += 1.0
+        elif q in lower[i]:
+            sim += 0.5
+        ranked.append((-sim, lower[i], i))
+    return [i for _, _, i in heapq.nsmallest(limit, ranked)]
+
+def title_index_invalidate(kind: str, guild_id: int) -> None:
+    _title_indexes.pop((kind, int(guild_id)), None)
+
+async def _title_index_load(kind: str, guild_id: int) -> dict | None:
+    async with db_pool.acquire() as conn:
+        if kind == "prize":
+            rows = await conn.fetch("SELECT prize_id, title FROM prize_definitions WHERE guild_id=$1", guild_id)
+            return title_index_build([(r["title"], str(r["prize_id"]), None) for r in rows])
+        if kind == "pool":
+            rows = await conn.fetch("SELECT user_id, title, md5(lower(title)) AS k FROM movie_pool_picks WHERE guild_id=$1", guild_id)
+            return title_index_build([(r["title"], r["k"], int(r["user_id"])) for r in rows])
+        n = await conn.fetchval("SELECT COUNT(*) FROM movie_library_items WHERE guild_id=$1 AND active", guild_id)
+        if int(n or 0) > AUTOCOMPLETE_MEMORY_MAX:
+            return None
+        rows = await conn.fetch("SELECT sheet_key, title FROM movie_library_items WHERE guild_id=$1 AND active", guild_id)
+        return title_index_build([(r["title"], r["sheet_key"], None) for r in rows])
+
+async def title_index_get(kind: str, guild_id: int) -> dict | None:
+    """Returns the cached index, loading it on first use; None means "too big, ask Postgres"."""
+    key = (kind, int(guild_id))
+    if key in _title_indexes:
+        return _title_indexes[key]
+    idx = await _title_index_load(kind, int(guild_id))
+    _title_indexes[key] = idx
+    return idx
+
+async def _library_title_search_sql(guild_id: int, query: str, limit: int = 25) -> list[tuple[str, str]]:
+    q = " ".join((query or "").split())
+    async with db_pool.acquire() as conn:
+        if _pg_trgm_ok and len(q) >= 3:
+            rows = await conn.fetch("""
+                SELECT title, sheet_key FROM movie_library_items
+                WHERE guild_id=$1 AND active AND title % $2
+                ORDER BY similarity(title, $2) DESC, title ASC
+                LIMIT $3
+            """, guild_id, q, limit)
+        else:
+            rows = await conn.fetch("""
+                SELECT title, sheet_key FROM movie_library_items
+                WHERE guild_id=$1 AND active AND lower(title) LIKE $2
+                ORDER BY title ASC
+                LIMIT $3
+            """, guild_id, q.lower().replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%", limit)
+    return [(r["title"], r["sheet_key"]) for r in rows]
+
+# Choice values are capped at 100 characters. Titles that fit are sent as-is (so typed titles
+# and chosen ones look the same to the command); longer ones are sent as a key the command
+# resolves with title_choice_resolve.
+TITLE_KEY_PREFIX = "#key:"
+
+def _title_choice(name: str, key: str):
+    value = name if len(name) <= 100 else f"{TITLE_KEY_PREFIX}{key}"
+    return discord.app_commands.Choice(name=name[:100], value=value)
+
+def _title_choices(idx: dict, hits: list[int]) -> list:
+    return [_title_choice(idx["names"][i], idx["values"][i]) for i in hits]
+
+async def title_choice_resolve(kind: str, guild_id: int, value: str, user_id: int | None = None) -> str:
+    """Map an autocomplete key back to the full title; anything else is returned unchanged."""
+    if not value.startswith(TITLE_KEY_PREFIX):
+        return value
+    key = value[len(TITLE_KEY_PREFIX):]
+    async with db_pool.acquire() as conn:
+        if kind == "pool":
+            title = await conn.fetchval(
+                "SELECT title FROM movie_pool_picks WHERE guild_id=$1 AND user_id=$2 AND md5(lower(title))=$3",
+                guild_id, user_id, key
+            )
+        else:
+            title = await conn.fetchval(
+                "SELECT title FROM movie_library_items WHERE guild_id=$1 AND sheet_key=$2",
+                guild_id, key
+            )
+    return title or value
+
+async def pool_pick_autocomplete(interaction: discord.Interaction, current: str):
+    if interaction.guild is None:
+        return []
+    try:
+        idx = await title_index_get("pool", int(interaction.guild.id))
+    except Exception:
+        return []
+    return _title_choices(idx, title_index_search(idx, current, owner=int(interaction.user.id)))
+
+async def library_title_autocomplete(interaction: discord.Interaction, current: str):
+    if interaction.guild is None:
+        return []
+    guild_id = int(interaction.guild.id)
+    try:
+        idx = await title_index_get("library", guild_id)
+        if idx is None:
+            titles = await _library_title_search_sql(guild_id, current)
+            return [_title_choice(t, k) for t, k in titles]
+    except Exception:
+        return []
+    return _title_choices(idx, title_index_search(idx, current))
+
 async def timezone_autocomplete(interaction: discord.Interaction, current: str):
     current_l = (current or "").lower()
     common = [
@@ -1664,12 +2358,10 @@ async def timezone_autocomplete(interaction: discord.Interaction, current: str):
 async def prize_autocomplete(interaction: discord.Interaction, current: str):
     if interaction.guild is None:
         return []
-    guild_id = int(interaction.guild.id)
-    rows = await prize_find_definitions(guild_id, current, limit=25)
+    idx = await title_index_get("prize", int(interaction.guild.id))
     out = []
-    for r in rows:
-        name = r["title"][:90]
-        out.append(discord.app_commands.Choice(name=name, value=str(r["prize_id"])))
+    for i in title_index_search(idx, current):
+        out.append(discord.app_commands.Choice(name=idx["names"][i][:90], value=idx["values"][i]))
     return out
 
 async def schedule_autocomplete(interaction: discord.Interaction, current: str):
@@ -1693,71 +2385,67 @@ async def schedule_autocomplete(interaction: discord.Interaction, current: str):
 
 ############### BACKGROUND TASKS & SCHEDULERS ###############
 
-async def birthday_daily_loop(bot: commands.Bot):
-    last_seen: dict[int, date] = {}
-    while not bot.is_closed():
-        try:
-            async with db_pool.acquire() as conn:
-                rows = await conn.fetch("SELECT guild_id, timezone, birthday_enabled, birthday_role_id, birthday_channel_id, birthday_message_text FROM guild_settings;")
-            for r in rows:
-                guild_id = int(r["guild_id"])
-                tz = r["timezone"] or "America/Los_Angeles"
-                today = guild_now(tz).date()
-                if last_seen.get(guild_id) == today:
-                    continue
-                last_seen[guild_id] = today
-
-                guild = bot.get_guild(guild_id)
-                if guild is None:
-                    continue
+async def birthday_run_guilds(bot: commands.Bot, guild_ids: list[int], today: date) -> None:
+    """Apply birthday roles and announcements for guilds whose local date is `today`."""
+    if not guild_ids:
+        return
+    async with db_pool.acquire() as conn:
+        rows = await conn.fetch(
+            """
+            SELECT gs.guild_id, gs.birthday_role_id, gs.birthday_channel_id, gs.birthday_message_text,
+                   b.user_id, (l.user_id IS NOT NULL) AS announced
+            FROM guild_settings gs
+            LEFT JOIN birthdays b ON b.guild_id = gs.guild_id AND b.month = $2 AND b.day = $3
+            LEFT JOIN birthday_announce_log l ON l.guild_id = b.guild_id AND l.user_id = b.user_id AND l.day = $4
+            WHERE gs.guild_id = ANY($1::bigint[])
+              AND gs.birthday_enabled = TRUE
+              AND gs.birthday_role_id IS NOT NULL
+              AND gs.birthday_channel_id IS NOT NULL;
+            """,
+            [int(g) for g in guild_ids],
+            today.month,
+            today.day,
+            today,
+        )
+    by_guild: dict[int, dict] = {}
+    for r in rows:
+        g = by_guild.setdefault(int(r["guild_id"]), {"row": r, "todays": {}})
+        if r["user_id"] is not None:
+            g["todays"][int(r["user_id"])] = bool(r["announced"])
 
-                if not r.get("birthday_enabled"):
-                    continue
-                if not r.get("birthday_role_id") or not r.get("birthday_channel_id"):
+    for guild_id, g in by_guild.items():
+        guild = bot.get_guild(guild_id)
+        if guild is None:
+            continue
+        r = g["row"]
+        todays = g["todays"]
+        role = guild.get_role(int(r["birthday_role_id"]))
+        if role:
+            for m in role.members:
+                if int(m.id) not in todays:
+                    queue_role_change(m, role, False, "Birthday ended")
+
+        if todays:
+            channel = guild.get_channel(int(r["birthday_channel_id"]))
+            msg_t = r["birthday_message_text"] or MSG["birthday_announce"]
+            for uid, was_announced in todays.items():
+                member = guild.get_member(uid)
+                if member is None:
                     continue
-
-                role_id = r["birthday_role_id"]
-                role = guild.get_role(int(role_id)) if role_id else None
-
-                bdays = await birthday_list_all(guild_id)
-                todays = [b for b in bdays if int(b["month"]) == today.month and int(b["day"]) == today.day]
                 if role:
+                    queue_role_change(member, role, True, "Birthday")
+                if channel and not was_announced:
                     try:
-                        for m in role.members:
-                            if int(m.id) not in {int(b["user_id"]) for b in todays}:
-                                await m.remove_roles(role, reason="Birthday ended")
+                        await channel.send(format_template(msg_t, member))
                     except Exception:
-                        pass
-
-                if not todays:
-                    await update_birthday_list_message(bot, guild_id)
-                    continue
-
-                channel = guild.get_channel(int(r["birthday_channel_id"])) if r["birthday_channel_id"] else None
-                msg_t = r["birthday_message_text"] or MSG["birthday_announce"]
-
-                for b in todays:
-                    uid = int(b["user_id"])
-                    member = guild.get_member(uid)
-                    if member is None:
                         continue
-                    if role:
-                        try:
-                            await member.add_roles(role, reason="Birthday")
-                        except Exception:
-                            pass
-                    if channel:
-                        try:
-                            if not await birthday_was_announced(guild_id, uid, today):
-                                await channel.send(format_template(msg_t, member))
-                                await birthday_mark_announced(guild_id, uid, today)
-                        except Exception:
-                            pass
-
-                await update_birthday_list_message(bot, guild_id)
+                    # Logged per send so a crash mid-run can't cause a repeat announcement.
+                    await birthday_mark_announced(guild_id, uid, today)
+
+        try:
+            await update_birthday_list_message(bot, guild_id)
         except Exception:
             pass
-        await asyncio.sleep(60)
 
 async def update_birthday_list_message(bot: commands.Bot, guild_id: int) -> None:
     try:
@@ -1790,115 +2478,450 @@ async def update_birthday_list_message(bot: commands.Bot, guild_id: int) -> None
     except Exception:
         pass
 
-async def qotd_daily_loop(bot: commands.Bot):
-    last_seen: dict[int, date] = {}
-    while not bot.is_closed():
-        try:
-            async with db_pool.acquire() as conn:
-                rows = await conn.fetch("SELECT guild_id, timezone, qotd_channel_id, qotd_role_id, qotd_message_prefix, qotd_source_url FROM guild_settings;")
-            for r in rows:
-                guild_id = int(r["guild_id"])
-                tz = r["timezone"] or "America/Los_Angeles"
-                today = guild_now(tz).date()
-                now_local = guild_now(tz)
-                if now_local.hour != 9:
-                    continue
-                if last_seen.get(guild_id) == today:
-                    continue
-                if not r["qotd_channel_id"] or not r["qotd_source_url"]:
-                    continue
-                if await qotd_was_posted_today(guild_id, today):
-                    last_seen[guild_id] = today
-                    continue
+async def qotd_run_guild(bot: commands.Bot, guild_id: int, today: date) -> None:
+    r = await get_guild_extras(guild_id)
+    if not r.get("qotd_channel_id") or not r.get("qotd_source_url"):
+        return
+    if await qotd_was_posted_today(guild_id, today):
+        return
 
-                guild = bot.get_guild(guild_id)
-                if guild is None:
-                    continue
-                channel = guild.get_channel(int(r["qotd_channel_id"]))
-                if channel is None:
-                    continue
+    guild = bot.get_guild(guild_id)
+    if guild is None:
+        return
+    channel = guild.get_channel(int(r["qotd_channel_id"]))
+    if channel is None:
+        return
 
+    try:
+        pick = await qotd_pick_question(guild_id, r["qotd_source_url"])
+    except Exception:
+        return
+    if not pick:
+        return
+
+    prefix = r["qotd_message_prefix"] or MSG["qotd_header"]
+    role_ping = ""
+    if r["qotd_role_id"]:
+        role = guild.get_role(int(r["qotd_role_id"]))
+        if role:
+            role_ping = role.mention + " "
+    try:
+        await channel.send(f"{role_ping}{prefix}\n{pick}")
+        await qotd_record_post(guild_id, today, pick)
+    except Exception:
+        pass
+
+# -------- Job scheduler --------
+# One priority queue of due times replaces the per-feature polling loops. Jobs are keyed so
+# they can be rescheduled in place; stale heap entries are skipped when popped.
+_sched_heap: list[tuple[datetime, int, str]] = []
+_sched_jobs: dict[str, dict] = {}
+_sched_seq = itertools.count()
+_sched_wakeup = asyncio.Event()
+
+def next_local_time(tz_name: str, at: time, after: datetime | None = None) -> datetime:
+    local_now = (after or now_utc()).astimezone(tz_zone(tz_name))
+    candidate = datetime.combine(local_now.date(), at, tzinfo=local_now.tzinfo)
+    if candidate <= local_now:
+        candidate = datetime.combine(local_now.date() + timedelta(days=1), at, tzinfo=local_now.tzinfo)
+    return candidate.astimezone(ZoneInfo("UTC"))
+
+def _sched_push(kind: str, job_key: str, due_at: datetime, payload: dict) -> None:
+    seq = next(_sched_seq)
+    _sched_jobs[job_key] = {"kind": kind, "due_at": due_at, "payload": payload, "seq": seq}
+    heapq.heappush(_sched_heap, (due_at, seq, job_key))
+    if _sched_heap[0][2] == job_key:
+        _sched_wakeup.set()
+
+async def schedule_job(kind: str, job_key: str, due_at: datetime, payload: dict | None = None) -> None:
+    """Queue (or move) a job; it is persisted so it survives restarts."""
+    payload = payload or {}
+    async with db_pool.acquire() as conn:
+        await conn.execute(
+            """
+            INSERT INTO scheduled_jobs (job_key, kind, due_at, payload)
+            VALUES ($1, $2, $3, $4::jsonb)
+            ON CONFLICT (job_key)
+            DO UPDATE SET kind = EXCLUDED.kind, due_at = EXCLUDED.due_at, payload = EXCLUDED.payload;
+            """,
+            job_key,
+            kind,
+            due_at,
+            json.dumps(payload),
+        )
+    _sched_push(kind, job_key, due_at, payload)
+
+async def cancel_job(job_key: str) -> None:
+    _sched_jobs.pop(job_key, None)
+    async with db_pool.acquire() as conn:
+        await conn.execute("DELETE FROM scheduled_jobs WHERE job_key = $1;", job_key)
+
+# Daily jobs run per timezone, not per guild: each bucket holds the guilds sharing a
+# timezone and gets one job at local midnight (birthdays) and one at 09:00 (QOTD).
+_tz_buckets: dict[str, set[int]] = {}
+_guild_tz: dict[int, str] = {}
+DAILY_TZ_JOBS = (("birthday_tz", time(0, 0)), ("qotd_tz", time(9, 0)))
+
+def _tz_bucket_move(guild_id: int, tz: str) -> str | None:
+    """Put the guild in tz's bucket; return its previous timezone if that bucket is now empty."""
+    old = _guild_tz.get(guild_id)
+    _guild_tz[guild_id] = tz
+    _tz_buckets.setdefault(tz, set()).add(guild_id)
+    if old is None or old == tz:
+        return None
+    bucket = _tz_buckets.get(old)
+    if bucket is not None:
+        bucket.discard(guild_id)
+        if not bucket:
+            del _tz_buckets[old]
+            return old
+    return None
+
+async def scheduler_ensure_daily_jobs(guild_id: int) -> None:
+    settings = await get_guild_settings(guild_id)
+    tz = settings["timezone"]
+    emptied = _tz_bucket_move(guild_id, tz)
+    if emptied:
+        for kind, _ in DAILY_TZ_JOBS:
+            await cancel_job(f"{kind}:{emptied}")
+    for kind, at in DAILY_TZ_JOBS:
+        key = f"{kind}:{tz}"
+        if key not in _sched_jobs:
+            await schedule_job(kind, key, next_local_time(tz, at), {"tz": tz})
+
+async def active_sweep_job(bot: commands.Bot, payload: dict) -> None:
+    guild_id = int(payload["guild_id"])
+    due = await active_cleanup_guild(bot, guild_id)
+    if due is not None:
+        await schedule_job("active_sweep", f"active_sweep:{guild_id}", due, payload)
+
+async def birthday_tz_job(bot: commands.Bot, payload: dict) -> None:
+    tz = payload["tz"]
+    guild_ids = list(_tz_buckets.get(tz, ()))
+    if not guild_ids:
+        return
+    await birthday_run_guilds(bot, guild_ids, guild_now(tz).date())
+    # Only move on to tomorrow after a clean run; if this raised, scheduler_loop retries
+    # in SCHEDULER_RETRY_SECONDS (the announce log keeps a retry from double-posting).
+    await schedule_job("birthday_tz", f"birthday_tz:{tz}", next_local_time(tz, time(0, 0)), payload)
+
+async def qotd_tz_job(bot: commands.Bot, payload: dict) -> None:
+    tz = payload["tz"]
+    guild_ids = list(_tz_buckets.get(tz, ()))
+    if not guild_ids:
+        return
+    local_now = guild_now(tz)
+    # A job that was due while the bot was down still posts later the same day.
+    if local_now.hour >= 9:
+        async with db_pool.acquire() as conn:
+            rows = await conn.fetch(
+                """
+                SELECT guild_id FROM guild_settings
+                WHERE guild_id = ANY($1::bigint[]) AND qotd_channel_id IS NOT NULL AND qotd_source_url IS NOT NULL;
+                """,
+                guild_ids,
+            )
+        for r in rows:
+            try:
+                await qotd_run_guild(bot, int(r["guild_id"]), local_now.date())
+            except Exception:
+                pass
+    # As with birthdays, a failure above leaves the retry to scheduler_loop.
+    await schedule_job("qotd_tz", f"qotd_tz:{tz}", next_local_time(tz, time(9, 0)), payload)
+
+SCHEDULER_HANDLERS = {
+    "active_sweep": active_sweep_job,
+    "plague_expire": plague_expire_job,
+    "birthday_tz": birthday_tz_job,
+    "qotd_tz": qotd_tz_job,
+}
+
+async def scheduler_bootstrap() -> None:
+    async with db_pool.acquire() as conn:
+        # Infections recorded before jobs were persisted
+        await conn.execute(
+            """
+            INSERT INTO scheduled_jobs (job_key, kind, due_at, payload)
+            SELECT 'plague_expire:' || guild_id || ':' || user_id, 'plague_expire', expires_at,
+                   jsonb_build_object('guild_id', guild_id, 'user_id', user_id)
+            FROM plague_infections
+            ON CONFLICT (job_key) DO NOTHING;
+            """
+        )
+        jobs = await conn.fetch("SELECT job_key, kind, due_at, payload FROM scheduled_jobs;")
+        guilds = await conn.fetch("SELECT guild_id, timezone, active_role_id FROM guild_settings;")
+    stale_keys = []
+    for j in jobs:
+        if j["kind"] not in SCHEDULER_HANDLERS:
+            stale_keys.append(j["job_key"])
+            continue
+        _sched_push(j["kind"], j["job_key"], j["due_at"], json.loads(j["payload"]))
+    now = now_utc()
+    missing = []
+
+    def _want(kind: str, key: str, due_at: datetime, payload: dict) -> None:
+        if key not in _sched_jobs:
+            _sched_push(kind, key, due_at, payload)
+            missing.append((key, kind, due_at, json.dumps(payload)))
+
+    for g in guilds:
+        guild_id = int(g["guild_id"])
+        _tz_bucket_move(guild_id, g["timezone"] or "America/Los_Angeles")
+        if g["active_role_id"]:
+            _want("active_sweep", f"active_sweep:{guild_id}", now, {"guild_id": guild_id})
+    for tz in _tz_buckets:
+        _want("birthday_tz", f"birthday_tz:{tz}", now, {"tz": tz})
+        _want("qotd_tz", f"qotd_tz:{tz}", next_local_time(tz, time(9, 0), now), {"tz": tz})
+    async with db_pool.acquire() as conn:
+        if stale_keys:
+            await conn.execute("DELETE FROM scheduled_jobs WHERE job_key = ANY($1::text[]);", stale_keys)
+        if missing:
+            await conn.executemany(
+                "INSERT INTO scheduled_jobs (job_key, kind, due_at, payload) VALUES ($1, $2, $3, $4::jsonb) ON CONFLICT (job_key) DO NOTHING;",
+                missing,
+            )
+
+async def scheduler_loop(bot: commands.Bot):
+    # Nothing is scheduled until the bootstrap succeeds, so keep retrying rather than letting
+    # a brief DB outage at startup kill the task.
+    delay = min(5.0, SCHEDULER_RETRY_SECONDS)
+    while True:
+        try:
+            await scheduler_bootstrap()
+            break
+        except Exception as e:
+            print(f"⚠️ Scheduler bootstrap failed, retrying in {delay:.0f}s: {e!r}")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, SCHEDULER_RETRY_SECONDS)
+    while True:
+        _sched_wakeup.clear()
+        now = now_utc()
+        due = []
+        while _sched_heap and _sched_heap[0][0] <= now:
+            _, seq, key = heapq.heappop(_sched_heap)
+            job = _sched_jobs.get(key)
+            if job is None or job["seq"] != seq:
+                continue
+            del _sched_jobs[key]
+            due.append((key, job))
+        for key, job in due:
+            try:
+                await SCHEDULER_HANDLERS[job["kind"]](bot, job["payload"])
+            except Exception:
+                if key not in _sched_jobs:
+                    _sched_push(job["kind"], key, now_utc() + timedelta(seconds=SCHEDULER_RETRY_SECONDS), job["payload"])
+                continue
+            if key not in _sched_jobs:
                 try:
-                    questions = await fetch_questions_from_source(r["qotd_source_url"])
-                except Exception:
-                    continue
-                if not questions:
-                    continue
-                recent = await qotd_recent_hashes(guild_id, limit=300)
-                pick = None
-                for q in questions:
-                    if _hash_question(q) not in recent:
-                        pick = q
-                        break
-                if pick is None:
-                    pick = questions[0] 
-
-                prefix = r["qotd_message_prefix"] or MSG["qotd_header"]
-                role_ping = ""
-                if r["qotd_role_id"]:
-                    role = guild.get_role(int(r["qotd_role_id"]))
-                    if role:
-                        role_ping = role.mention + " "
-                try:
-                    await channel.send(f"{role_ping}{prefix}\n{pick}")
-                    await qotd_record_post(guild_id, today, pick)
-                    last_seen[guild_id] = today
+                    async with db_pool.acquire() as conn:
+                        await conn.execute("DELETE FROM scheduled_jobs WHERE job_key = $1;", key)
                 except Exception:
                     pass
-        except Exception:
+        if due:
+            continue
+        timeout = None
+        if _sched_heap:
+            timeout = max(0.0, (_sched_heap[0][0] - now_utc()).total_seconds())
+        try:
+            await asyncio.wait_for(_sched_wakeup.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
             pass
-        await asyncio.sleep(30)
 
 # -------- Message-level scheduler helpers --------
-_autodelete_tasks: dict[tuple[int,int,int], asyncio.Task] = {}
+# Auto-delete timers. New timers are buffered and written to autodelete_pending in batches;
+# a single consumer keeps a heap of (delete_at, channel_id, message_id, guild_id), bulk-deletes
+# whatever is due per channel and removes the rows. Pending rows are replayed on startup.
+_autodelete_buffer: list[tuple[int, int, int, datetime]] = []
+_autodelete_heap: list[tuple[datetime, int, int, int]] = []
+BULK_DELETE_MAX_AGE = timedelta(days=14)
+
+async def schedule_message_delete(message: discord.Message, delay_seconds: int):
+    delete_at = now_utc() + timedelta(seconds=max(1, delay_seconds))
+    entry = (int(message.channel.id), int(message.id), int(message.guild.id), delete_at)
+    _autodelete_buffer.append(entry)
+    heapq.heappush(_autodelete_heap, (delete_at, entry[0], entry[1], entry[2]))
+
+async def autodelete_flush() -> int:
+    global _autodelete_buffer
+    if not _autodelete_buffer or db_pool is None:
+        return 0
+    batch, _autodelete_buffer = _autodelete_buffer, []
+    try:
+        async with db_pool.acquire() as conn:
+            await conn.execute(
+                """
+                INSERT INTO autodelete_pending (channel_id, message_id, guild_id, delete_at)
+                SELECT * FROM unnest($1::bigint[], $2::bigint[], $3::bigint[], $4::timestamptz[])
+                ON CONFLICT (channel_id, message_id) DO UPDATE SET delete_at = EXCLUDED.delete_at;
+                """,
+                [b[0] for b in batch],
+                [b[1] for b in batch],
+                [b[2] for b in batch],
+                [b[3] for b in batch],
+            )
+    except Exception:
+        _autodelete_buffer[:0] = batch
+        raise
+    return len(batch)
 
-async def schedule_message_delete(message: discord.Message, delay_seconds: int, log_channel_id: int | None):
-    key = (int(message.guild.id), int(message.channel.id), int(message.id))
-    async def _job():
+async def autodelete_replay() -> int:
+    async with db_pool.acquire() as conn:
+        rows = await conn.fetch("SELECT channel_id, message_id, guild_id, delete_at FROM autodelete_pending;")
+    for r in rows:
+        heapq.heappush(_autodelete_heap, (r["delete_at"], int(r["channel_id"]), int(r["message_id"]), int(r["guild_id"])))
+    return len(rows)
+
+async def _autodelete_channel(bot: commands.Bot, channel_id: int, message_ids: list[int]) -> None:
+    channel = bot.get_channel(channel_id)
+    if channel is None:
+        return
+    cutoff = now_utc() - BULK_DELETE_MAX_AGE + timedelta(minutes=1)
+    young = [m for m in message_ids if discord.utils.snowflake_time(m) > cutoff]
+    old = [m for m in message_ids if discord.utils.snowflake_time(m) <= cutoff]
+    for i in range(0, len(young), 100):
+        chunk = [discord.Object(id=m) for m in young[i:i + 100]]
         try:
-            await asyncio.sleep(max(1, delay_seconds))
-            try:
-                await message.delete()
-            except Exception:
-                pass
-        finally:
-            _autodelete_tasks.pop(key, None)
-    t = asyncio.create_task(_job())
-    _autodelete_tasks[key] = t
+            await channel.delete_messages(chunk, reason="Auto-delete")
+        except Exception:
+            pass
+    for m in old:
+        try:
+            await channel.get_partial_message(m).delete()
+        except Exception:
+            pass
 
+async def autodelete_process_due(bot: commands.Bot) -> int:
+    now = now_utc()
+    due: dict[int, list[int]] = {}
+    while _autodelete_heap and _autodelete_heap[0][0] <= now:
+        _, channel_id, message_id, _ = heapq.heappop(_autodelete_heap)
+        due.setdefault(channel_id, []).append(message_id)
+    if not due:
+        return 0
+    for channel_id, message_ids in due.items():
+        await _autodelete_channel(bot, channel_id, message_ids)
+    keys = [(c, m) for c, ms in due.items() for m in ms]
+    async with db_pool.acquire() as conn:
+        await conn.execute(
+            """
+            DELETE FROM autodelete_pending p
+            USING unnest($1::bigint[], $2::bigint[]) AS d(channel_id, message_id)
+            WHERE p.channel_id = d.channel_id AND p.message_id = d.message_id;
+            """,
+            [k[0] for k in keys],
+            [k[1] for k in keys],
+        )
+    return len(keys)
 
-async def active_cleanup_loop(bot: commands.Bot):
+async def autodelete_loop(bot: commands.Bot):
+    while True:
+        try:
+            await autodelete_replay()
+            break
+        except Exception:
+            await asyncio.sleep(SCHEDULER_RETRY_SECONDS)
     while True:
         try:
-            await active_cleanup_once(bot)
+            await autodelete_flush()
+            await autodelete_process_due(bot)
         except Exception:
             pass
-        await asyncio.sleep(60)
+        timeout = AUTODELETE_FLUSH_SECONDS
+        if _autodelete_heap:
+            timeout = min(timeout, max(0.0, (_autodelete_heap[0][0] - now_utc()).total_seconds()))
+        await asyncio.sleep(timeout)
 
-async def plague_cleanup_loop(bot: commands.Bot):
+async def activity_flush_loop():
     while True:
+        await asyncio.sleep(ACTIVITY_FLUSH_SECONDS)
         try:
-            await plague_cleanup_once(bot)
+            await flush_activity()
         except Exception:
             pass
-        await asyncio.sleep(60)
 
 async def deadchat_cleanup_loop():
     while True:
-        await asyncio.sleep(300)
+        await asyncio.sleep(DEADCHAT_CHECKPOINT_SECONDS)
+        try:
+            await deadchat_checkpoint()
+        except Exception:
+            pass
 
 
 ############### BIRTHDAY / QOTD / STICKY / AUTODELETE / VOICE / WELCOME HELPERS ###############
+import csv
 import hashlib
+import io
 import aiohttp
 
+# -------- HTTP client --------
+http_stats = {"requests": 0, "retries": 0, "failures": 0, "total_ms": 0.0, "max_ms": 0.0}
+
+async def open_http() -> aiohttp.ClientSession:
+    global http_session
+    if http_session is None or http_session.closed:
+        http_session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=HTTP_MAX_CONNECTIONS,
+                limit_per_host=HTTP_MAX_PER_HOST,
+                ttl_dns_cache=300,
+                keepalive_timeout=60,
+            ),
+            timeout=aiohttp.ClientTimeout(total=30),
+        )
+    return http_session
+
+async def close_http() -> None:
+    global http_session
+    if http_session is not None:
+        await http_session.close()
+        http_session = None
+
+async def http_get_text(url: str, headers: dict | None = None, timeout: float = 30) -> tuple[int, dict, str]:
+    """GET through the shared session with retries on 429/5xx/network errors; returns (status, lowercased headers, text)."""
+    session = await open_http()
+    delay = 0.5
+    for attempt in range(HTTP_RETRIES + 1):
+        started = monotonic()
+        try:
+            async with session.get(url, headers=headers, timeout=aiohttp.ClientTimeout(total=timeout)) as resp:
+                if (resp.status == 429 or resp.status >= 500) and attempt < HTTP_RETRIES:
+                    raise aiohttp.ClientResponseError(resp.request_info, resp.history, status=resp.status)
+                resp.raise_for_status()
+                if (resp.content_length or 0) > HTTP_MAX_RESPONSE_BYTES:
+                    raise ValueError(f"response from {url} exceeds {HTTP_MAX_RESPONSE_BYTES} bytes")
+                body = bytearray()
+                async for chunk in resp.content.iter_chunked(65536):
+                    body.extend(chunk)
+                    if len(body) > HTTP_MAX_RESPONSE_BYTES:
+                        raise ValueError(f"response from {url} exceeds {HTTP_MAX_RESPONSE_BYTES} bytes")
+                text = body.decode(resp.charset or "utf-8", errors="replace")
+                return resp.status, {k.lower(): v for k, v in resp.headers.items()}, text
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            status = getattr(e, "status", None)
+            retryable = status is None or status == 429 or status >= 500
+            if not retryable or attempt >= HTTP_RETRIES:
+                http_stats["failures"] += 1
+                raise
+            http_stats["retries"] += 1
+        except Exception:
+            http_stats["failures"] += 1
+            raise
+        finally:
+            elapsed_ms = (monotonic() - started) * 1000
+            http_stats["requests"] += 1
+            http_stats["total_ms"] += elapsed_ms
+            http_stats["max_ms"] = max(http_stats["max_ms"], elapsed_ms)
+        await asyncio.sleep(delay)
+        delay *= 2
+
 def _hash_question(q: str) -> str:
     return hashlib.sha256(q.strip().encode("utf-8")).hexdigest()
 
 async def get_guild_extras(guild_id: int) -> dict:
     async with db_pool.acquire() as conn:
         row = await conn.fetchrow("""SELECT
-            birthday_role_id, birthday_channel_id, birthday_message_text,
+            birthday_enabled, birthday_role_id, birthday_channel_id, birthday_message_text,
             birthday_list_channel_id, birthday_list_message_id,
             qotd_channel_id, qotd_role_id, qotd_message_prefix, qotd_source_url, qotd_last_posted_date,
             welcome_channel_id, welcome_message_text, welcome_enabled, member_role_id, member_role_delay_seconds, bot_role_id,
@@ -1940,11 +2963,6 @@ async def birthday_mark_announced(guild_id: int, user_id: int, d: date) -> None:
             guild_id, user_id, d
         )
 
-async def birthday_was_announced(guild_id: int, user_id: int, d: date) -> bool:
-    async with db_pool.acquire() as conn:
-        r = await conn.fetchrow("SELECT 1 FROM birthday_announce_log WHERE guild_id=$1 AND user_id=$2 AND day=$3;", guild_id, user_id, d)
-    return r is not None
-
 async def birthday_set_role_channel_message(guild_id: int, role_id: int | None, channel_id: int | None, message_text: str | None) -> None:
     async with db_pool.acquire() as conn:
         await ensure_guild_row(guild_id)
@@ -1966,6 +2984,7 @@ async def birthday_set_enabled(guild_id: int, enabled: bool) -> None:
             int(guild_id),
             bool(enabled),
         )
+    await scheduler_ensure_daily_jobs(int(guild_id))
 
 
 async def birthday_set_list_message(guild_id: int, channel_id: int | None, message_id: int | None) -> None:
@@ -1986,19 +3005,68 @@ async def sticky_set(guild_id: int, channel_id: int, content: str) -> None:
                    SET content=EXCLUDED.content, updated_at=NOW();""",
             guild_id, channel_id, content
         )
+    state = _sticky_state.get((guild_id, channel_id))
+    if state is not None:
+        state["content"] = content
 
 async def sticky_clear(guild_id: int, channel_id: int) -> None:
     async with db_pool.acquire() as conn:
         await conn.execute("DELETE FROM sticky_messages WHERE guild_id=$1 AND channel_id=$2;", guild_id, channel_id)
-
-async def sticky_get(guild_id: int, channel_id: int):
-    async with db_pool.acquire() as conn:
-        return await conn.fetchrow("SELECT content,message_id FROM sticky_messages WHERE guild_id=$1 AND channel_id=$2;", guild_id, channel_id)
+    state = _sticky_state.pop((guild_id, channel_id), None)
+    if state is not None and state["task"] is not None:
+        state["task"].cancel()
 
 async def sticky_update_message_id(guild_id: int, channel_id: int, message_id: int | None) -> None:
     async with db_pool.acquire() as conn:
         await conn.execute("UPDATE sticky_messages SET message_id=$3, updated_at=NOW() WHERE guild_id=$1 AND channel_id=$2;", guild_id, channel_id, message_id)
 
+# In-memory sticky state per (guild_id, channel_id): content, message_id, the pending repost
+# task and the monotonic time it should fire. Hydrated from the message context on first use;
+# after that memory is authoritative and the DB copy of message_id is written behind.
+_sticky_state: dict[tuple[int, int], dict] = {}
+
+def sticky_bump(channel: discord.abc.Messageable, guild_id: int, sticky: dict) -> None:
+    """Note a message in a sticky channel; the repost fires after STICKY_QUIET_SECONDS without another one."""
+    key = (guild_id, int(channel.id))
+    state = _sticky_state.get(key)
+    if state is None:
+        state = {"content": sticky["content"], "message_id": sticky["message_id"], "task": None, "due": 0.0}
+        _sticky_state[key] = state
+    state["due"] = monotonic() + STICKY_QUIET_SECONDS
+    if state["task"] is None:
+        state["task"] = asyncio.create_task(_sticky_repost(channel, key, state))
+
+async def _sticky_repost(channel: discord.abc.Messageable, key: tuple[int, int], state: dict) -> None:
+    fired_at = None
+    try:
+        while True:
+            wait = state["due"] - monotonic()
+            if wait <= 0:
+                break
+            await asyncio.sleep(wait)
+        fired_at = state["due"]
+        old_id = state["message_id"]
+        if old_id:
+            try:
+                await channel.get_partial_message(int(old_id)).delete()
+            except Exception:
+                pass
+        try:
+            new_msg = await channel.send(state["content"])
+        except Exception:
+            new_msg = None
+        state["message_id"] = int(new_msg.id) if new_msg else None
+        await sticky_update_message_id(key[0], key[1], state["message_id"])
+    except asyncio.CancelledError:
+        raise
+    except Exception:
+        pass
+    finally:
+        state["task"] = None
+        # Messages that arrived while we were reposting need one more repost.
+        if fired_at is not None and state["due"] > fired_at and _sticky_state.get(key) is state:
+            state["task"] = asyncio.create_task(_sticky_repost(channel, key, state))
+
 # -------- Autodelete --------
 async def autodelete_set_channel(guild_id: int, channel_id: int, seconds: int, log_channel_id: int | None) -> None:
     async with db_pool.acquire() as conn:
@@ -2014,26 +3082,37 @@ async def autodelete_remove_channel(guild_id: int, channel_id: int) -> None:
     async with db_pool.acquire() as conn:
         await conn.execute("DELETE FROM autodelete_channels WHERE guild_id=$1 AND channel_id=$2;", guild_id, channel_id)
 
-async def autodelete_get_channel(guild_id: int, channel_id: int):
-    async with db_pool.acquire() as conn:
-        return await conn.fetchrow("SELECT delete_after_seconds,log_channel_id FROM autodelete_channels WHERE guild_id=$1 AND channel_id=$2;", guild_id, channel_id)
-
 async def autodelete_add_ignore_phrase(guild_id: int, phrase: str) -> None:
     phrase = phrase.strip()
     if not phrase:
         return
     async with db_pool.acquire() as conn:
         await conn.execute("INSERT INTO autodelete_ignore_phrases (guild_id,phrase) VALUES ($1,$2) ON CONFLICT DO NOTHING;", guild_id, phrase)
+    _ignore_matchers.pop(guild_id, None)
 
 async def autodelete_remove_ignore_phrase(guild_id: int, phrase: str) -> None:
     async with db_pool.acquire() as conn:
         await conn.execute("DELETE FROM autodelete_ignore_phrases WHERE guild_id=$1 AND phrase=$2;", guild_id, phrase.strip())
+    _ignore_matchers.pop(guild_id, None)
 
 async def autodelete_list_ignore_phrases(guild_id: int) -> list[str]:
     async with db_pool.acquire() as conn:
         rows = await conn.fetch("SELECT phrase FROM autodelete_ignore_phrases WHERE guild_id=$1 ORDER BY phrase ASC;", guild_id)
     return [r["phrase"] for r in rows]
 
+# Per guild, every ignore phrase compiled into one case-folded alternation (None when the
+# guild has no phrases). Rebuilt only after the phrase set changes.
+_ignore_matchers: dict[int, re.Pattern | None] = {}
+
+async def autodelete_ignore_matcher(guild_id: int) -> re.Pattern | None:
+    if guild_id in _ignore_matchers:
+        return _ignore_matchers[guild_id]
+    phrases = await autodelete_list_ignore_phrases(guild_id)
+    lowered = sorted({p.lower() for p in phrases}, key=len, reverse=True)
+    matcher = re.compile("|".join(re.escape(p) for p in lowered)) if lowered else None
+    _ignore_matchers[guild_id] = matcher
+    return matcher
+
 # -------- Voice Role Links --------
 async def voice_role_set_link(guild_id: int, voice_channel_id: int, role_id: int, mode: str) -> None:
     async with db_pool.acquire() as conn:
@@ -2044,19 +3123,28 @@ async def voice_role_set_link(guild_id: int, voice_channel_id: int, role_id: int
                    SET role_id=EXCLUDED.role_id, mode=EXCLUDED.mode;""",
             guild_id, voice_channel_id, role_id, mode
         )
+    _voice_links.pop(guild_id, None)
 
 async def voice_role_remove_link(guild_id: int, voice_channel_id: int) -> None:
     async with db_pool.acquire() as conn:
         await conn.execute("DELETE FROM voice_role_links WHERE guild_id=$1 AND voice_channel_id=$2;", guild_id, voice_channel_id)
+    _voice_links.pop(guild_id, None)
 
 async def voice_role_list_links(guild_id: int):
     async with db_pool.acquire() as conn:
         rows = await conn.fetch("SELECT voice_channel_id,role_id,mode FROM voice_role_links WHERE guild_id=$1 ORDER BY voice_channel_id ASC;", guild_id)
     return [dict(r) for r in rows]
 
-async def voice_role_get_link(guild_id: int, voice_channel_id: int):
-    async with db_pool.acquire() as conn:
-        return await conn.fetchrow("SELECT role_id,mode FROM voice_role_links WHERE guild_id=$1 AND voice_channel_id=$2;", guild_id, voice_channel_id)
+# Per guild mirror of voice_role_links: voice_channel_id -> {"role_id", "mode"}.
+_voice_links: dict[int, dict[int, dict]] = {}
+
+async def voice_role_links_for(guild_id: int) -> dict[int, dict]:
+    links = _voice_links.get(guild_id)
+    if links is None:
+        rows = await voice_role_list_links(guild_id)
+        links = {int(r["voice_channel_id"]): {"role_id": int(r["role_id"]), "mode": r["mode"]} for r in rows}
+        _voice_links[guild_id] = links
+    return links
 
 # -------- Welcome / Modlog --------
 
@@ -2124,6 +3212,7 @@ async def qotd_set(guild_id: int, channel_id: int | None, role_id: int | None, p
               WHERE guild_id=$1;""",
             guild_id, channel_id, role_id, prefix, source_url
         )
+    await scheduler_ensure_daily_jobs(guild_id)
 
 async def qotd_record_post(guild_id: int, posted_on: date, question_text: str) -> None:
     qh = _hash_question(question_text)
@@ -2139,26 +3228,99 @@ async def qotd_was_posted_today(guild_id: int, d: date) -> bool:
         r = await conn.fetchrow("SELECT 1 FROM qotd_history WHERE guild_id=$1 AND posted_on=$2;", guild_id, d)
     return r is not None
 
-async def qotd_recent_hashes(guild_id: int, limit: int = 200) -> set[str]:
+async def qotd_recent_hashes(guild_id: int, limit: int = 200) -> list[str]:
+    """Hashes of the guild's most recent questions, newest first."""
     async with db_pool.acquire() as conn:
         rows = await conn.fetch("SELECT question_hash FROM qotd_history WHERE guild_id=$1 ORDER BY posted_on DESC LIMIT $2;", guild_id, limit)
-    return {r["question_hash"] for r in rows}
-
-async def fetch_questions_from_source(source_url: str) -> list[str]:
-    async with aiohttp.ClientSession() as session:
-        async with session.get(source_url, timeout=aiohttp.ClientTimeout(total=20)) as resp:
-            resp.raise_for_status()
-            txt = await resp.text()
-    if "," in txt.splitlines()[0]:
-        out=[]
-        for line in txt.splitlines()[1:]:
-            if not line.strip():
-                continue
-            q=line.split(",")[0].strip().strip('"')
-            if q:
-                out.append(q)
-        return out
-    return [l.strip() for l in txt.splitlines() if l.strip()]
+    return [r["question_hash"] for r in rows]
+
+def parse_question_sheet(txt: str) -> list[str]:
+    """Questions from column 0 of a CSV export; the first row is the header."""
+    out = []
+    reader = csv.reader(io.StringIO(txt))
+    next(reader, None)
+    for row in reader:
+        if row and row[0].strip():
+            out.append(row[0].strip())
+    return out
+
+# Question banks per source URL, shared by every guild using that sheet: questions in sheet
+# order, their precomputed hashes, hash -> position, and the validators for conditional GETs.
+_qotd_banks: dict[str, dict] = {}
+_qotd_bank_locks: dict[str, asyncio.Lock] = {}
+
+async def qotd_question_bank(source_url: str) -> dict:
+    lock = _qotd_bank_locks.setdefault(source_url, asyncio.Lock())
+    async with lock:
+        bank = _qotd_banks.get(source_url)
+        if bank is not None and monotonic() - bank["checked_at"] < QOTD_SOURCE_TTL_SECONDS:
+            return bank
+        headers = {}
+        if bank is not None:
+            if bank["etag"]:
+                headers["If-None-Match"] = bank["etag"]
+            if bank["last_modified"]:
+                headers["If-Modified-Since"] = bank["last_modified"]
+        status, resp_headers, txt = await http_get_text(source_url, headers=headers, timeout=20)
+        if status == 304 and bank is not None:
+            bank["checked_at"] = monotonic()
+            return bank
+        etag = resp_headers.get("etag")
+        last_modified = resp_headers.get("last-modified")
+        questions = parse_question_sheet(txt)
+        hashes = [_hash_question(q) for q in questions]
+        index: dict[str, int] = {}
+        for i, h in enumerate(hashes):
+            index.setdefault(h, i)
+        bank = {
+            "questions": questions,
+            "hashes": hashes,
+            "index": index,
+            "etag": etag,
+            "last_modified": last_modified,
+            "checked_at": monotonic(),
+        }
+        _qotd_banks[source_url] = bank
+        return bank
+
+async def qotd_pick_question(guild_id: int, source_url: str) -> str | None:
+    """Next question after the last one posted that is not among the last 300 posts."""
+    bank = await qotd_question_bank(source_url)
+    questions = bank["questions"]
+    if not questions:
+        return None
+    history = await qotd_recent_hashes(guild_id, limit=300)
+    recent = set(history)
+    start = bank["index"].get(history[0], -1) + 1 if history else 0
+    n = len(questions)
+    for i in range(n):
+        pos = (start + i) % n
+        if bank["hashes"][pos] not in recent:
+            return questions[pos]
+    return questions[0]
+
+# -------- Message context --------
+async def load_message_context(guild_id: int, channel_id: int) -> dict:
+    """Fetch everything the on_message handlers need for one channel in a single round trip."""
+    settings = await get_guild_settings(guild_id)
+    async with db_pool.acquire() as conn:
+        row = await conn.fetchrow(MESSAGE_CONTEXT_SQL, guild_id, channel_id)
+    deadchat = None
+    if row["deadchat_configured"]:
+        deadchat = {"enabled": bool(row["deadchat_enabled"]), "idle_minutes": row["deadchat_idle_minutes"]}
+    sticky = None
+    if row["sticky_content"] is not None:
+        sticky = {"content": row["sticky_content"], "message_id": row["sticky_message_id"]}
+    autodelete = None
+    if row["delete_after_seconds"] is not None:
+        autodelete = {"delete_after_seconds": int(row["delete_after_seconds"]), "log_channel_id": row["log_channel_id"]}
+    return {
+        "settings": settings,
+        "count_activity": settings["active_mode"] == "all" or bool(row["is_activity_channel"]),
+        "deadchat": deadchat,
+        "sticky": sticky,
+        "autodelete": autodelete,
+    }
 
 def format_template(t: str, user: discord.abc.User) -> str:
     return (t or "").replace("{user}", user.mention).replace("{name}", user.display_name)
@@ -2180,49 +3342,38 @@ async def on_message(message: discord.Message):
     guild_id = int(message.guild.id)
     channel_id = int(message.channel.id)
     try:
-        if await should_count_activity_message(guild_id, channel_id):
-            await ensure_guild_row(guild_id)
+        ctx = await load_message_context(guild_id, channel_id)
+    except Exception:
+        await bot.process_commands(message)
+        return
+    try:
+        if ctx["count_activity"]:
             await record_activity(guild_id, int(message.author.id))
             if isinstance(message.author, discord.Member):
-                await maybe_apply_active_role(message.author)
+                await maybe_apply_active_role(message.author, ctx["settings"])
     except Exception:
         pass
     try:
-        if await deadchat_is_configured(guild_id, channel_id):
-            await deadchat_attempt_award(bot, message)
-        else:
-            await deadchat_update_last_message(guild_id, channel_id)
+        if ctx["deadchat"]:
+            await deadchat_attempt_award(bot, message, ctx)
     except Exception:
         pass
 
     try:
-        s = await sticky_get(guild_id, channel_id)
+        s = ctx["sticky"]
         if s:
-            old_id = s["message_id"]
-            content = s["content"]
-            if old_id:
-                try:
-                    old_msg = await message.channel.fetch_message(int(old_id))
-                    await old_msg.delete()
-                except Exception:
-                    pass
-            try:
-                new_msg = await message.channel.send(content)
-                await sticky_update_message_id(guild_id, channel_id, int(new_msg.id))
-            except Exception:
-                pass
+            sticky_bump(message.channel, guild_id, s)
     except Exception:
         pass
 
     try:
-        ad = await autodelete_get_channel(guild_id, channel_id)
+        ad = ctx["autodelete"]
         if ad:
-            phrases = await autodelete_list_ignore_phrases(guild_id)
-            lowered = (message.content or "").lower()
-            if any(p.lower() in lowered for p in phrases):
+            matcher = await autodelete_ignore_matcher(guild_id)
+            if matcher is not None and matcher.search((message.content or "").lower()):
                 pass
             else:
-                await schedule_message_delete(message, int(ad["delete_after_seconds"]), int(ad["log_channel_id"]) if ad["log_channel_id"] else None)
+                await schedule_message_delete(message, int(ad["delete_after_seconds"]))
     except Exception:
         pass
     await bot.process_commands(message)
@@ -2240,20 +3391,14 @@ async def on_member_join(member: discord.Member):
         if member.bot and s.get("bot_role_id"):
             role = member.guild.get_role(int(s["bot_role_id"]))
             if role:
-                try:
-                    await member.add_roles(role, reason="Auto role for bots")
-                except Exception:
-                    pass
+                queue_role_change(member, role, True, "Auto role for bots")
         if (not member.bot) and s.get("member_role_id"):
             role = member.guild.get_role(int(s["member_role_id"]))
             if role:
                 delay = int(s.get("member_role_delay_seconds") or 0)
                 async def _add_later():
                     await asyncio.sleep(max(0, delay))
-                    try:
-                        await member.add_roles(role, reason="Delayed member role")
-                    except Exception:
-                        pass
+                    queue_role_change(member, role, True, "Delayed member role")
                 asyncio.create_task(_add_later())
 
         if s.get("welcome_enabled") and s.get("welcome_channel_id"):
@@ -2275,11 +3420,28 @@ async def on_member_join(member: discord.Member):
     except Exception:
         pass
 
+@bot.event
+async def on_member_update(before: discord.Member, after: discord.Member):
+    entry = _active_role_holders.get(int(after.guild.id))
+    if entry is None:
+        return
+    role_id = entry[0]
+    had = any(int(r.id) == role_id for r in before.roles)
+    has = any(int(r.id) == role_id for r in after.roles)
+    if had != has:
+        active_role_holders_update(int(after.guild.id), role_id, int(after.id), has)
+
 @bot.event
 async def on_member_remove(member: discord.Member):
     if member.guild is None:
         return
     guild_id = int(member.guild.id)
+    entry = _active_role_holders.get(guild_id)
+    if entry is not None:
+        entry[1].discard(int(member.id))
+    carry = _active_sweep_carry.get(guild_id)
+    if carry is not None:
+        carry.discard(int(member.id))
     try:
         s = await get_guild_extras(guild_id)
         if (not s.get("logging_enabled")) or (not s.get("modlog_channel_id")):
@@ -2334,33 +3496,27 @@ async def on_member_ban(guild: discord.Guild, user: discord.User):
 async def on_voice_state_update(member: discord.Member, before: discord.VoiceState, after: discord.VoiceState):
     if member.guild is None:
         return
-    guild_id = int(member.guild.id)
+    before_id = int(before.channel.id) if before.channel else None
+    after_id = int(after.channel.id) if after.channel else None
+    if before_id == after_id:
+        # Mute/deafen/stream changes.
+        return
+    links = await voice_role_links_for(int(member.guild.id))
+    if not links:
+        return
 
-    if before.channel and (not after.channel or int(after.channel.id) != int(before.channel.id)):
-        link = await voice_role_get_link(guild_id, int(before.channel.id))
-        if link:
-            role = member.guild.get_role(int(link["role_id"]))
-            if role:
-                try:
-                    if link["mode"] == "add_on_join":
-                        await member.remove_roles(role, reason="Left voice channel")
-                    else:
-                        await member.add_roles(role, reason="Left voice channel")
-                except Exception:
-                    pass
+    # Queued ops on the same role replace each other, so rapid hops collapse to the final state.
+    link = links.get(before_id) if before_id else None
+    if link:
+        role = member.guild.get_role(link["role_id"])
+        if role:
+            queue_role_change(member, role, link["mode"] != "add_on_join", "Left voice channel")
 
-    if after.channel and (not before.channel or int(before.channel.id) != int(after.channel.id)):
-        link = await voice_role_get_link(guild_id, int(after.channel.id))
-        if link:
-            role = member.guild.get_role(int(link["role_id"]))
-            if role:
-                try:
-                    if link["mode"] == "add_on_join":
-                        await member.add_roles(role, reason="Joined voice channel")
-                    else:
-                        await member.remove_roles(role, reason="Joined voice channel")
-                except Exception:
-                    pass
+    link = links.get(after_id) if after_id else None
+    if link:
+        role = member.guild.get_role(link["role_id"])
+        if role:
+            queue_role_change(member, role, link["mode"] == "add_on_join", "Joined voice channel")
 
 
 
@@ -2724,15 +3880,7 @@ async def config_qotd_cmd(
     if not channel:
         return await interaction.response.send_message("❌ QOTD channel not found.", ephemeral=True)
     try:
-        questions = await fetch_questions_from_source(s["qotd_source_url"])
-        recent = await qotd_recent_hashes(guild_id, limit=300)
-        pick = None
-        for q in questions:
-            if _hash_question(q) not in recent:
-                pick = q
-                break
-        if pick is None:
-            pick = questions[0] if questions else None
+        pick = await qotd_pick_question(guild_id, s["qotd_source_url"])
         if not pick:
             return await interaction.response.send_message("❌ No questions found at source.", ephemeral=True)
         role_ping = ""
@@ -3357,69 +4505,11 @@ def _movies_default_csv_url() -> str | None:
     return f"https://docs.google.com/spreadsheets/d/{sheet_id}/gviz/tq?tqx=out:csv&sheet={quote_plus(tab)}"
 
 async def ensure_movie_tables():
-    """Create movie tables if they don't exist yet. Called lazily from movie commands only."""
+    """Movie tables are created by the schema migrations in init_db; this only makes sure
+    the pool is up for callers that can run before startup finished."""
     global db_pool
     if db_pool is None:
         await init_db()
-    async with db_pool.acquire() as conn:
-        await conn.execute("""
-        CREATE TABLE IF NOT EXISTS movie_settings (
-            guild_id BIGINT PRIMARY KEY,
-            mode TEXT NOT NULL DEFAULT 'public_manual',
-            per_user_limit INT NOT NULL DEFAULT 3,
-            pool_display_channel_id BIGINT,
-            pool_display_message_id BIGINT,
-            announce_channel_id_1 BIGINT,
-            announce_channel_id_2 BIGINT,
-            library_channel_id BIGINT,
-            library_source_url TEXT,
-            updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
-        );
-        """)
-        await conn.execute("""
-        CREATE TABLE IF NOT EXISTS movie_pool_picks (
-            guild_id BIGINT NOT NULL,
-            user_id BIGINT NOT NULL,
-            title TEXT NOT NULL,
-            added_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
-            PRIMARY KEY (guild_id, lower(title))
-        );
-        """)
-        await conn.execute("""
-        CREATE INDEX IF NOT EXISTS idx_movie_pool_picks_guild_user
-        ON movie_pool_picks (guild_id, user_id);
-        """)
-        # Dev/library tables (only used in DEV guild)
-        await conn.execute("""
-        CREATE TABLE IF NOT EXISTS movie_library_items (
-            guild_id BIGINT NOT NULL,
-            sheet_key TEXT NOT NULL,
-            title TEXT NOT NULL,
-            poster_url TEXT,
-            trailer_url TEXT,
-            active BOOLEAN NOT NULL DEFAULT TRUE,
-            updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
-            PRIMARY KEY (guild_id, sheet_key)
-        );
-        """)
-        await conn.execute("""
-        CREATE TABLE IF NOT EXISTS movie_library_messages (
-            guild_id BIGINT NOT NULL,
-            sheet_key TEXT NOT NULL,
-            channel_id BIGINT NOT NULL,
-            message_id BIGINT NOT NULL,
-            updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
-            PRIMARY KEY (guild_id, sheet_key)
-        );
-        """)
-        await conn.execute("""
-        CREATE TABLE IF NOT EXISTS movie_night_history (
-            guild_id BIGINT NOT NULL,
-            title TEXT NOT NULL,
-            picked_by BIGINT,
-            picked_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
-        );
-        """)
 
 async def movie_get_settings(guild_id: int) -> dict:
     await ensure_movie_tables()
@@ -3448,32 +4538,50 @@ async def movie_set_settings(guild_id: int, **kwargs) -> None:
 def _norm_title(t: str) -> str:
     return " ".join(t.strip().split())
 
+# Bumped on every pool write; rendered pool pages are cached against it.
+_pool_versions: dict[int, int] = {}
+
+def movie_pool_changed(guild_id: int) -> None:
+    _pool_versions[int(guild_id)] = _pool_versions.get(int(guild_id), 0) + 1
+    title_index_invalidate("pool", guild_id)
+
+# One statement decides the outcome: the unique index rejects duplicates pool-wide and the
+# count guard enforces the per-user limit. The advisory lock serialises a single user's
+# concurrent adds so two of them cannot both pass the count guard.
+MOVIE_POOL_ADD_SQL = """
+WITH lim AS (
+  SELECT COALESCE((SELECT per_user_limit FROM movie_settings WHERE guild_id=$1), 3) AS n
+), cnt AS (
+  SELECT COUNT(*) AS n FROM movie_pool_picks WHERE guild_id=$1 AND user_id=$2
+), ins AS (
+  INSERT INTO movie_pool_picks (guild_id, user_id, title)
+  SELECT $1, $2, $3 FROM cnt, lim WHERE cnt.n < lim.n
+  ON CONFLICT (guild_id, lower(title)) DO NOTHING
+  RETURNING 1
+)
+SELECT EXISTS (SELECT 1 FROM ins) AS inserted,
+       EXISTS (SELECT 1 FROM movie_pool_picks WHERE guild_id=$1 AND lower(title)=lower($3)) AS duplicate,
+       (SELECT n FROM cnt) >= (SELECT n FROM lim) AS at_limit;
+"""
+
 async def movie_pool_add(guild_id: int, user_id: int, title: str) -> tuple[bool, str]:
     """Returns (ok, error_code) where error_code is one of: duplicate, limit."""
     await ensure_movie_tables()
     title = _norm_title(title)
-    settings = await movie_get_settings(guild_id)
-    limit = int(settings.get("per_user_limit") or 3)
     async with db_pool.acquire() as conn:
-        # duplicate check (pool-wide)
-        existing = await conn.fetchrow(
-            "SELECT 1 FROM movie_pool_picks WHERE guild_id=$1 AND lower(title)=lower($2)",
-            guild_id, title
-        )
-        if existing:
-            return False, "duplicate"
-        # per-user limit
-        cnt = await conn.fetchval(
-            "SELECT COUNT(*) FROM movie_pool_picks WHERE guild_id=$1 AND user_id=$2",
-            guild_id, user_id
-        )
-        if cnt is not None and int(cnt) >= limit:
-            return False, "limit"
-        await conn.execute(
-            "INSERT INTO movie_pool_picks (guild_id, user_id, title) VALUES ($1, $2, $3)",
-            guild_id, user_id, title
-        )
-    return True, ""
+        async with conn.transaction():
+            await conn.execute(
+                "SELECT pg_advisory_xact_lock(hashtext('movie_pool_picks'), hashtext($1::bigint::text || ':' || $2::bigint::text))",
+                guild_id, user_id
+            )
+            row = await conn.fetchrow(MOVIE_POOL_ADD_SQL, guild_id, user_id, title)
+    if row["inserted"]:
+        movie_pool_changed(guild_id)
+        return True, ""
+    # Under the limit but not inserted means ON CONFLICT hit a pick committed after our snapshot.
+    if row["duplicate"] or not row["at_limit"]:
+        return False, "duplicate"
+    return False, "limit"
 
 async def movie_pool_remove(guild_id: int, user_id: int, title: str) -> bool:
     await ensure_movie_tables()
@@ -3483,6 +4591,7 @@ async def movie_pool_remove(guild_id: int, user_id: int, title: str) -> bool:
             "DELETE FROM movie_pool_picks WHERE guild_id=$1 AND user_id=$2 AND lower(title)=lower($3)",
             guild_id, user_id, title
         )
+    movie_pool_changed(guild_id)
     # asyncpg returns "DELETE X"
     try:
         n = int(res.split()[-1])
@@ -3494,63 +4603,149 @@ async def movie_pool_list(guild_id: int) -> list[dict]:
     await ensure_movie_tables()
     async with db_pool.acquire() as conn:
         rows = await conn.fetch(
-            "SELECT guild_id, user_id, title, added_at FROM movie_pool_picks WHERE guild_id=$1",
+            "SELECT guild_id, user_id, title, added_at FROM movie_pool_picks WHERE guild_id=$1 ORDER BY added_at, title",
             guild_id
         )
     return [dict(r) for r in rows]
 
-async def movie_pool_render_embed(guild: discord.Guild) -> discord.Embed:
+# Discord caps an embed description at 4096 characters and a message at 10 embeds / 6000
+# characters across all of them. Pages are kept small enough that several fit in one message.
+POOL_PAGE_CHARS = 1800
+MESSAGE_EMBEDS_MAX = 10
+MESSAGE_EMBED_CHARS_MAX = 6000
+
+# guild_id -> ((pool version, per-user limit), rendered pages)
+_pool_render_cache: dict[int, tuple[tuple[int, int], list[discord.Embed]]] = {}
+
+async def movie_pool_render_pages(guild: discord.Guild) -> list[discord.Embed]:
+    """Render the pool as a list of embed pages, grouped by user and sorted by display name."""
     settings = await movie_get_settings(int(guild.id))
+    limit = int(settings.get("per_user_limit") or 3)
+    key = (_pool_versions.get(int(guild.id), 0), limit)
+    cached = _pool_render_cache.get(int(guild.id))
+    if cached is not None and cached[0] == key:
+        return cached[1]
+
     picks = await movie_pool_list(int(guild.id))
-    embed = discord.Embed(title=MOVIE_MSG["pool_title"])
     if not picks:
-        embed.description = MOVIE_MSG["pool_empty"]
-        return embed
+        pages = [discord.Embed(title=MOVIE_MSG["pool_title"], description=MOVIE_MSG["pool_empty"])]
+        _pool_render_cache[int(guild.id)] = (key, pages)
+        return pages
 
-    # Group by user_id
+    # Group by user_id, resolving each member once
     by_user: dict[int, list[str]] = {}
     for r in picks:
         by_user.setdefault(int(r["user_id"]), []).append(r["title"])
-
-    # Resolve names + sort by name
     groups = []
     for uid, titles in by_user.items():
         member = guild.get_member(uid)
         name = member.display_name if member else str(uid)
-        groups.append((name.lower(), name, uid, titles))
+        header = member.mention if member else name
+        groups.append((name.lower(), header, titles))
     groups.sort(key=lambda x: x[0])
 
-    lines = []
-    for _, name, uid, titles in groups:
-        member = guild.get_member(uid)
-        header = member.mention if member else name
-        lines.append(f"**{header}**")
+    # Stream groups into pages; a group that straddles a page break repeats its header.
+    bodies: list[list[str]] = [[]]
+    size = 0
+    for _, header, titles in groups:
+        head = f"**{header}**"
+        if bodies[-1] and size + len(head) + len(titles[0]) + 4 > POOL_PAGE_CHARS:
+            bodies.append([])
+            size = 0
+        bodies[-1].append(head)
+        size += len(head) + 1
         for t in titles:
-            lines.append(f"• {t}")
-        lines.append("")  # spacing
-    embed.description = "\n".join(lines).strip()
-    embed.set_footer(text=f"Total picks: {len(picks)} • Limit per user: {int(settings.get('per_user_limit') or 3)}")
-    return embed
+            line = f"• {t}"[:POOL_PAGE_CHARS - len(head) - 16]
+            if size + len(line) + 1 > POOL_PAGE_CHARS:
+                bodies.append([f"{head} (cont.)"])
+                size = len(head) + 9
+            bodies[-1].append(line)
+            size += len(line) + 1
+        bodies[-1].append("")  # spacing
+        size += 1
+
+    pages = []
+    for i, lines in enumerate(bodies, start=1):
+        title = MOVIE_MSG["pool_title"] if len(bodies) == 1 else f"{MOVIE_MSG['pool_title']} ({i}/{len(bodies)})"
+        embed = discord.Embed(title=title, description="\n".join(lines).strip())
+        embed.set_footer(text=f"Total picks: {len(picks)} • Limit per user: {limit}")
+        pages.append(embed)
+    _pool_render_cache[int(guild.id)] = (key, pages)
+    return pages
+
+def movie_pool_message_chunks(pages: list[discord.Embed]) -> list[list[discord.Embed]]:
+    """Split pages into per-message embed lists that respect Discord's message limits."""
+    chunks: list[list[discord.Embed]] = [[]]
+    size = 0
+    for page in pages:
+        if chunks[-1] and (len(chunks[-1]) >= MESSAGE_EMBEDS_MAX or size + len(page) > MESSAGE_EMBED_CHARS_MAX):
+            chunks.append([])
+            size = 0
+        chunks[-1].append(page)
+        size += len(page)
+    return chunks
+
+async def movie_pool_display_embeds(guild: discord.Guild) -> list[discord.Embed]:
+    """Embeds for the single persistent display message: as many pages as fit, and a pointer
+    to /pool when the rest do not."""
+    pages = await movie_pool_render_pages(guild)
+    shown = movie_pool_message_chunks(pages)[0]
+    if len(shown) < len(pages):
+        last = shown[-1].copy()
+        last.set_footer(text=f"{last.footer.text} • Showing {len(shown)}/{len(pages)} pages, use /pool for all")
+        shown = shown[:-1] + [last]
+    return shown
+
+# Per-guild pool display render state: the pending render task, a dirty flag, when it last
+# rendered, and the (message_id, embed hash) last written so unchanged renders skip the edit.
+_pool_display_state: dict[int, dict] = {}
+
+def movie_embeds_hash(embeds: list[discord.Embed]) -> str:
+    return hashlib.sha256(json.dumps([e.to_dict() for e in embeds], sort_keys=True).encode("utf-8")).hexdigest()
 
 async def movie_pool_update_display(guild: discord.Guild) -> None:
-    """If a persistent pool display message is configured, update it."""
-    settings = await movie_get_settings(int(guild.id))
-    ch_id = settings.get("pool_display_channel_id")
-    msg_id = settings.get("pool_display_message_id")
-    if not ch_id or not msg_id:
-        return
-    channel = guild.get_channel(int(ch_id))
-    if channel is None:
-        return
-    try:
-        msg = await channel.fetch_message(int(msg_id))
-    except Exception:
-        return
-    embed = await movie_pool_render_embed(guild)
+    """Mark the pool display dirty; it re-renders at most once per MOVIE_POOL_RENDER_SECONDS."""
+    state = _pool_display_state.get(int(guild.id))
+    if state is None:
+        state = {"task": None, "dirty": False, "last_at": 0.0, "rendered": None}
+        _pool_display_state[int(guild.id)] = state
+    state["dirty"] = True
+    if state["task"] is None:
+        state["task"] = asyncio.create_task(_movie_pool_render_display(guild, state))
+
+async def _movie_pool_render_display(guild: discord.Guild, state: dict) -> None:
     try:
-        await msg.edit(embed=embed)
+        while state["dirty"]:
+            wait = state["last_at"] + MOVIE_POOL_RENDER_SECONDS - monotonic()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            state["dirty"] = False
+            state["last_at"] = monotonic()
+            settings = await movie_get_settings(int(guild.id))
+            ch_id = settings.get("pool_display_channel_id")
+            msg_id = settings.get("pool_display_message_id")
+            if not ch_id or not msg_id:
+                continue
+            channel = guild.get_channel(int(ch_id))
+            if channel is None:
+                continue
+            embeds = await movie_pool_display_embeds(guild)
+            rendered = (int(msg_id), movie_embeds_hash(embeds))
+            if rendered == state["rendered"]:
+                continue
+            try:
+                await channel.get_partial_message(int(msg_id)).edit(embeds=embeds)
+                state["rendered"] = rendered
+            except Exception:
+                pass
+    except asyncio.CancelledError:
+        raise
     except Exception:
         pass
+    finally:
+        state["task"] = None
+        if state["dirty"]:
+            state["task"] = asyncio.create_task(_movie_pool_render_display(guild, state))
 
 async def movie_pick_random(guild: discord.Guild) -> tuple[str | None, int | None]:
     """Returns (title, user_id) or (None, None) if empty."""
@@ -3571,6 +4766,7 @@ async def movie_pick_random(guild: discord.Guild) -> tuple[str | None, int | Non
             "INSERT INTO movie_night_history (guild_id, title, picked_by) VALUES ($1, $2, $3)",
             int(guild.id), title, user_id
         )
+    movie_pool_changed(int(guild.id))
     await movie_pool_update_display(guild)
     return title, user_id
 
@@ -3584,6 +4780,7 @@ async def browse_cmd(interaction: discord.Interaction):
 
 @bot.tree.command(name="pick", description="Add a movie to the Movie Night pool")
 @discord.app_commands.describe(title="Movie title (optional if this server has a synced movie database)")
+@discord.app_commands.autocomplete(title=library_title_autocomplete)
 async def pick_cmd(interaction: discord.Interaction, title: str | None = None):
     if interaction.guild is None:
         await interaction.response.send_message("❌ Must be used in a server.", ephemeral=True)
@@ -3602,7 +4799,7 @@ async def pick_cmd(interaction: discord.Interaction, title: str | None = None):
         await interaction.response.send_message("❌ Please provide a movie title.", ephemeral=True)
         return
 
-    title = _norm_title(title)
+    title = _norm_title(await title_choice_resolve("library", guild_id, title))
 
     ok, err = await movie_pool_add(guild_id, user_id, title)
     if not ok:
@@ -3628,13 +4825,14 @@ async def pick_cmd(interaction: discord.Interaction, title: str | None = None):
 
 @bot.tree.command(name="unpick", description="Remove one of your picks from the Movie Night pool")
 @discord.app_commands.describe(title="Movie title to remove")
+@discord.app_commands.autocomplete(title=pool_pick_autocomplete)
 async def unpick_cmd(interaction: discord.Interaction, title: str):
     if interaction.guild is None:
         await interaction.response.send_message("❌ Must be used in a server.", ephemeral=True)
         return
     guild_id = int(interaction.guild.id)
     user_id = int(interaction.user.id)
-    title = _norm_title(title)
+    title = _norm_title(await title_choice_resolve("pool", guild_id, title, user_id))
 
     removed = await movie_pool_remove(guild_id, user_id, title)
     if not removed:
@@ -3649,14 +4847,15 @@ async def unpick_cmd(interaction: discord.Interaction, title: str):
 
 @bot.tree.command(name="replace_pick", description="Replace one of your picks with a new title")
 @discord.app_commands.describe(old_title="Your existing pick to replace", new_title="The new title to add")
+@discord.app_commands.autocomplete(old_title=pool_pick_autocomplete, new_title=library_title_autocomplete)
 async def replace_pick_cmd(interaction: discord.Interaction, old_title: str, new_title: str):
     if interaction.guild is None:
         await interaction.response.send_message("❌ Must be used in a server.", ephemeral=True)
         return
     guild_id = int(interaction.guild.id)
     user_id = int(interaction.user.id)
-    old_title = _norm_title(old_title)
-    new_title = _norm_title(new_title)
+    old_title = _norm_title(await title_choice_resolve("pool", guild_id, old_title, user_id))
+    new_title = _norm_title(await title_choice_resolve("library", guild_id, new_title))
 
     removed = await movie_pool_remove(guild_id, user_id, old_title)
     if not removed:
@@ -3692,8 +4891,10 @@ async def pool_cmd(interaction: discord.Interaction):
     if interaction.guild is None:
         await interaction.response.send_message("❌ Must be used in a server.", ephemeral=True)
         return
-    embed = await movie_pool_render_embed(interaction.guild)
-    await interaction.response.send_message(embed=embed, ephemeral=True)
+    chunks = movie_pool_message_chunks(await movie_pool_render_pages(interaction.guild))
+    await interaction.response.send_message(embeds=chunks[0], ephemeral=True)
+    for embeds in chunks[1:]:
+        await interaction.followup.send(embeds=embeds, ephemeral=True)
 
 @bot.tree.command(name="random", description="Pick a random winner from the Movie Night pool")
 async def random_cmd(interaction: discord.Interaction):
@@ -3725,27 +4926,85 @@ async def _require_dev_guild(interaction: discord.Interaction) -> bool:
         return False
     return True
 
-async def _fetch_csv_rows(url: str) -> list[dict]:
-    # Expected headers: title, poster_url, trailer_url (extra columns ignored)
-    async with aiohttp.ClientSession() as session:
-        async with session.get(url, timeout=aiohttp.ClientTimeout(total=30)) as resp:
-            resp.raise_for_status()
-            text = await resp.text()
-    import csv, io
-    buf = io.StringIO(text)
-    reader = csv.DictReader(buf)
-    rows = []
-    for i, row in enumerate(reader, start=1):
+def _parse_csv_rows(text: str):
+    """Yield library rows from a downloaded CSV export.
+
+    Expected headers: title, poster_url, trailer_url (extra columns ignored). Quoted fields may
+    contain newlines.
+    """
+    header = None
+    i = 0
+    for values in csv.reader(io.StringIO(text)):
+        if header is None:
+            if any(v.strip() for v in values):
+                header = [h.strip() for h in values]
+            continue
+        # Number every data row like csv.DictReader did (only empty lines are skipped), so
+        # sheet_key stays stable for rows below a blank ",," line.
+        if not values:
+            continue
+        i += 1
+        row = dict(zip(header, values))
         title = _norm_title(row.get("title", "") or "")
         if not title:
             continue
-        rows.append({
+        yield {
             "sheet_key": str(i),
             "title": title,
             "poster_url": (row.get("poster_url") or row.get("poster") or "").strip() or None,
             "trailer_url": (row.get("trailer_url") or row.get("trailer") or "").strip() or None,
-        })
-    return rows
+        }
+
+MOVIE_LIBRARY_MERGE_SQL = """
+WITH upserted AS (
+  INSERT INTO movie_library_items (guild_id, sheet_key, title, poster_url, trailer_url, active)
+  SELECT $1, sheet_key, title, poster_url, trailer_url, TRUE FROM movie_library_staging
+  ON CONFLICT (guild_id, sheet_key)
+  DO UPDATE SET title=EXCLUDED.title, poster_url=EXCLUDED.poster_url, trailer_url=EXCLUDED.trailer_url,
+                active=TRUE, updated_at=NOW()
+  WHERE (movie_library_items.title, movie_library_items.poster_url, movie_library_items.trailer_url, movie_library_items.active)
+        IS DISTINCT FROM (EXCLUDED.title, EXCLUDED.poster_url, EXCLUDED.trailer_url, TRUE)
+  RETURNING 1
+), deactivated AS (
+  UPDATE movie_library_items SET active=FALSE, updated_at=NOW()
+  WHERE guild_id=$1 AND active AND sheet_key NOT IN (SELECT sheet_key FROM movie_library_staging)
+  RETURNING 1
+)
+SELECT (SELECT count(*) FROM movie_library_staging) AS total,
+       (SELECT count(*) FROM upserted) AS changed,
+       (SELECT count(*) FROM deactivated) AS deactivated;
+"""
+
+async def movie_library_reload(guild_id: int, url: str) -> dict:
+    """Download the CSV (with the shared client's retries), then COPY it into a temp staging
+    table and merge it in one statement. The download finishes before a pool connection is
+    taken, so a slow sheet server never holds a transaction open."""
+    await ensure_movie_tables()
+    _, _, text = await http_get_text(url, timeout=60)
+    records = [
+        (r["sheet_key"], r["title"], r["poster_url"], r["trailer_url"])
+        for r in _parse_csv_rows(text)
+    ]
+
+    async with db_pool.acquire() as conn:
+        async with conn.transaction():
+            await conn.execute("""
+                CREATE TEMP TABLE movie_library_staging (
+                    sheet_key TEXT PRIMARY KEY,
+                    title TEXT NOT NULL,
+                    poster_url TEXT,
+                    trailer_url TEXT
+                ) ON COMMIT DROP
+            """)
+            await conn.copy_records_to_table(
+                "movie_library_staging",
+                records=records,
+                columns=["sheet_key", "title", "poster_url", "trailer_url"],
+            )
+            row = await conn.fetchrow(MOVIE_LIBRARY_MERGE_SQL, int(guild_id))
+    title_index_invalidate("library", guild_id)
+    movie_library_snapshot_invalidate(guild_id)
+    return dict(row)
 
 class MovieAddToPoolView(discord.ui.View):
     def __init__(self, guild_id: int, title: str):
@@ -3803,9 +5062,9 @@ async def movies_set_pool_display_cmd(interaction: discord.Interaction):
     if interaction.guild is None:
         await interaction.response.send_message("❌ Must be used in a server.", ephemeral=True)
         return
-    embed = await movie_pool_render_embed(interaction.guild)
+    embeds = await movie_pool_display_embeds(interaction.guild)
     try:
-        msg = await interaction.channel.send(embed=embed)
+        msg = await interaction.channel.send(embeds=embeds)
     except Exception:
         await interaction.response.send_message("❌ Could not post pool message here.", ephemeral=True)
         return
@@ -3814,6 +5073,9 @@ async def movies_set_pool_display_cmd(interaction: discord.Interaction):
         pool_display_channel_id=int(interaction.channel.id),
         pool_display_message_id=int(msg.id),
     )
+    state = _pool_display_state.get(int(interaction.guild.id))
+    if state is not None:
+        state["rendered"] = (int(msg.id), movie_embeds_hash(embeds))
     await interaction.response.send_message(MOVIE_MSG["pool_message_ok"], ephemeral=True)
 
 @discord.app_commands.default_permissions(manage_guild=True)
@@ -3844,19 +5106,16 @@ async def movies_library_reload_cmd(interaction: discord.Interaction):
             ephemeral=True,
         )
         return
-    rows = await _fetch_csv_rows(src)
-    async with db_pool.acquire() as conn:
-        # mark all inactive, then upsert actives
-        await conn.execute("UPDATE movie_library_items SET active=FALSE WHERE guild_id=$1", int(interaction.guild.id))
-        for r in rows:
-            await conn.execute("""
-                INSERT INTO movie_library_items (guild_id, sheet_key, title, poster_url, trailer_url, active)
-                VALUES ($1, $2, $3, $4, $5, TRUE)
-                ON CONFLICT (guild_id, sheet_key)
-                DO UPDATE SET title=EXCLUDED.title, poster_url=EXCLUDED.poster_url, trailer_url=EXCLUDED.trailer_url,
-                              active=TRUE, updated_at=NOW()
-            """, int(interaction.guild.id), r["sheet_key"], r["title"], r["poster_url"], r["trailer_url"])
-    await interaction.response.send_message(MOVIE_MSG["library_reload_ok"], ephemeral=True)
+    await interaction.response.defer(ephemeral=True, thinking=True)
+    try:
+        stats = await movie_library_reload(int(interaction.guild.id), src)
+    except Exception as e:
+        await interaction.followup.send(f"❌ Library reload failed: {e}", ephemeral=True)
+        return
+    await interaction.followup.send(
+        f"{MOVIE_MSG['library_reload_ok']} ({stats['total']} titles, {stats['changed']} changed, {stats['deactivated']} removed)",
+        ephemeral=True,
+    )
 
 @discord.app_commands.default_permissions(manage_guild=True)
 @movies_group.command(name="set_library_channel", description="Set the library channel for dev library sync")
@@ -3869,6 +5128,146 @@ async def movies_set_library_channel_cmd(interaction: discord.Interaction):
     await movie_set_settings(int(interaction.guild.id), library_channel_id=int(interaction.channel.id))
     await interaction.response.send_message("✅ Library channel set to this channel.", ephemeral=True)
 
+# -------- Library sync --------
+# Each movie_library_messages row remembers a hash of the embed content it was last rendered
+# with, so a sync only edits changed items, sends new ones and deletes deactivated ones.
+_library_sync_jobs: dict[int, dict] = {}
+
+def movie_library_content_hash(title: str, poster_url: str | None, trailer_url: str | None) -> str:
+    return hashlib.sha256(f"{title}\x1f{poster_url or ''}\x1f{trailer_url or ''}".encode("utf-8")).hexdigest()
+
+def movie_library_embed(title: str, poster_url: str | None, trailer_url: str | None) -> discord.Embed:
+    embed = discord.Embed(title=title)
+    if trailer_url:
+        embed.description = f"[Trailer]({trailer_url})"
+    if poster_url:
+        try:
+            embed.set_image(url=poster_url)
+        except Exception:
+            pass
+    return embed
+
+async def movie_library_sync_plan(guild_id: int, channel_id: int) -> dict:
+    async with db_pool.acquire() as conn:
+        rows = await conn.fetch("""
+            SELECT i.sheet_key, i.title, i.poster_url, i.trailer_url, i.active,
+                   m.channel_id, m.message_id, m.content_hash
+            FROM movie_library_items i
+            FULL OUTER JOIN movie_library_messages m ON m.guild_id = i.guild_id AND m.sheet_key = i.sheet_key
+            WHERE COALESCE(i.guild_id, m.guild_id) = $1
+            ORDER BY i.title ASC NULLS LAST
+        """, guild_id)
+    plan = {"edit": [], "send": [], "delete": []}
+    for r in rows:
+        active = bool(r["active"])
+        if not active:
+            if r["message_id"] is not None:
+                plan["delete"].append(dict(r))
+            continue
+        h = movie_library_content_hash(r["title"], r["poster_url"], r["trailer_url"])
+        item = dict(r)
+        item["content_hash"] = h
+        if r["message_id"] is None or int(r["channel_id"]) != channel_id:
+            plan["send"].append(item)
+        elif r["content_hash"] != h:
+            plan["edit"].append(item)
+    return plan
+
+def _library_sync_progress_text(job: dict) -> str:
+    state = "done" if job["finished"] else "running"
+    return f"{job['done']}/{job['total']} {state}, {job['failed']} failed"
+
+# Interaction tokens expire after 15 minutes; past this, progress goes to a normal message in
+# the channel the command was run from.
+INTERACTION_EDIT_WINDOW_SECONDS = 14 * 60
+
+async def _library_sync_report(interaction: discord.Interaction, job: dict, text: str) -> None:
+    try:
+        if monotonic() - job["started_at"] < INTERACTION_EDIT_WINDOW_SECONDS:
+            await interaction.edit_original_response(content=text)
+        elif job.get("status_message") is not None:
+            await job["status_message"].edit(content=text)
+        elif interaction.channel is not None:
+            job["status_message"] = await interaction.channel.send(text)
+    except Exception:
+        pass
+
+async def movie_library_sync_run(interaction: discord.Interaction, channel, plan: dict, job: dict) -> None:
+    guild_id = int(channel.guild.id)
+    upserts: list[tuple] = []
+    deletes: list[str] = []
+
+    async def _flush():
+        if not upserts and not deletes:
+            return
+        async with db_pool.acquire() as conn:
+            if upserts:
+                await conn.executemany("""
+                    INSERT INTO movie_library_messages (guild_id, sheet_key, channel_id, message_id, content_hash)
+                    VALUES ($1, $2, $3, $4, $5)
+                    ON CONFLICT (guild_id, sheet_key)
+                    DO UPDATE SET channel_id=EXCLUDED.channel_id, message_id=EXCLUDED.message_id,
+                                  content_hash=EXCLUDED.content_hash, updated_at=NOW()
+                """, upserts)
+            if deletes:
+                await conn.execute(
+                    "DELETE FROM movie_library_messages WHERE guild_id=$1 AND sheet_key = ANY($2::text[])",
+                    guild_id, deletes,
+                )
+        upserts.clear()
+        deletes.clear()
+
+    async def _send(item) -> bool:
+        embed = movie_library_embed(item["title"], item["poster_url"], item["trailer_url"])
+        view = MovieAddToPoolView(guild_id=guild_id, title=item["title"])
+        try:
+            new_msg = await channel.send(embed=embed, view=view)
+        except Exception:
+            return False
+        upserts.append((guild_id, item["sheet_key"], int(channel.id), int(new_msg.id), item["content_hash"]))
+        return True
+
+    try:
+        for action in ("delete", "edit", "send"):
+            for item in plan[action]:
+                ok = True
+                if action == "delete":
+                    try:
+                        old_channel = channel.guild.get_channel(int(item["channel_id"])) or channel
+                        await old_channel.get_partial_message(int(item["message_id"])).delete()
+                    except discord.NotFound:
+                        pass
+                    except Exception:
+                        ok = False
+                    if ok:
+                        deletes.append(item["sheet_key"])
+                elif action == "edit":
+                    embed = movie_library_embed(item["title"], item["poster_url"], item["trailer_url"])
+                    view = MovieAddToPoolView(guild_id=guild_id, title=item["title"])
+                    try:
+                        await channel.get_partial_message(int(item["message_id"])).edit(embed=embed, view=view)
+                        upserts.append((guild_id, item["sheet_key"], int(channel.id), int(item["message_id"]), item["content_hash"]))
+                    except discord.NotFound:
+                        ok = await _send(item)
+                    except Exception:
+                        ok = False
+                else:
+                    ok = await _send(item)
+                job["done"] += 1
+                if not ok:
+                    job["failed"] += 1
+                if job["done"] % 25 == 0:
+                    await _flush()
+                    await _library_sync_report(interaction, job, f"⏳ Library sync: {_library_sync_progress_text(job)}")
+                await asyncio.sleep(LIBRARY_SYNC_INTERVAL_SECONDS)
+    finally:
+        try:
+            await _flush()
+        except Exception:
+            pass
+        job["finished"] = True
+        await _library_sync_report(interaction, job, f"{MOVIE_MSG['library_sync_ok']} ({_library_sync_progress_text(job)})")
+
 @discord.app_commands.default_permissions(manage_guild=True)
 @movies_group.command(name="library_sync", description="Sync one message per movie into the configured library channel (dev only)")
 async def movies_library_sync_cmd(interaction: discord.Interaction):
@@ -3887,64 +5286,26 @@ async def movies_library_sync_cmd(interaction: discord.Interaction):
         await interaction.response.send_message("❌ Library channel not found.", ephemeral=True)
         return
 
-    async with db_pool.acquire() as conn:
-        items = await conn.fetch("""
-            SELECT sheet_key, title, poster_url, trailer_url
-            FROM movie_library_items
-            WHERE guild_id=$1 AND active=TRUE
-            ORDER BY title ASC
-        """, int(interaction.guild.id))
-        msg_map = {r["sheet_key"]: r for r in await conn.fetch("""
-            SELECT sheet_key, channel_id, message_id FROM movie_library_messages WHERE guild_id=$1
-        """, int(interaction.guild.id))}
-
-    for item in items:
-        sheet_key = item["sheet_key"]
-        title = item["title"]
-        poster_url = item["poster_url"]
-        trailer_url = item["trailer_url"]
-
-        embed = discord.Embed(title=title)
-        if trailer_url:
-            embed.description = f"[Trailer]({trailer_url})"
-        if poster_url:
-            try:
-                embed.set_image(url=poster_url)
-            except Exception:
-                pass
-        view = MovieAddToPoolView(guild_id=int(interaction.guild.id), title=title)
-
-        if sheet_key in msg_map:
-            try:
-                old_msg = await channel.fetch_message(int(msg_map[sheet_key]["message_id"]))
-                await old_msg.edit(embed=embed, view=view)
-            except Exception:
-                # If edit fails, post a new one and update mapping
-                try:
-                    new_msg = await channel.send(embed=embed, view=view)
-                except Exception:
-                    continue
-                async with db_pool.acquire() as conn:
-                    await conn.execute("""
-                        INSERT INTO movie_library_messages (guild_id, sheet_key, channel_id, message_id)
-                        VALUES ($1, $2, $3, $4)
-                        ON CONFLICT (guild_id, sheet_key)
-                        DO UPDATE SET channel_id=EXCLUDED.channel_id, message_id=EXCLUDED.message_id, updated_at=NOW()
-                    """, int(interaction.guild.id), sheet_key, int(channel.id), int(new_msg.id))
-        else:
-            try:
-                new_msg = await channel.send(embed=embed, view=view)
-            except Exception:
-                continue
-            async with db_pool.acquire() as conn:
-                await conn.execute("""
-                    INSERT INTO movie_library_messages (guild_id, sheet_key, channel_id, message_id)
-                    VALUES ($1, $2, $3, $4)
-                    ON CONFLICT (guild_id, sheet_key)
-                    DO UPDATE SET channel_id=EXCLUDED.channel_id, message_id=EXCLUDED.message_id, updated_at=NOW()
-                """, int(interaction.guild.id), sheet_key, int(channel.id), int(new_msg.id))
-
-    await interaction.response.send_message(MOVIE_MSG["library_sync_ok"], ephemeral=True)
+    guild_id = int(interaction.guild.id)
+    running = _library_sync_jobs.get(guild_id)
+    if running is not None and not running["task"].done():
+        await interaction.response.send_message(f"⏳ Library sync already running: {_library_sync_progress_text(running)}", ephemeral=True)
+        return
+    await interaction.response.defer(ephemeral=True, thinking=True)
+    plan = await movie_library_sync_plan(guild_id, int(channel.id))
+    if not plan["edit"] and not plan["send"] and not plan["delete"]:
+        await interaction.followup.send(f"{MOVIE_MSG['library_sync_ok']} (nothing changed)", ephemeral=True)
+        return
+    job = {
+        "total": len(plan["edit"]) + len(plan["send"]) + len(plan["delete"]),
+        "done": 0,
+        "failed": 0,
+        "finished": False,
+        "started_at": monotonic(),
+    }
+    job["task"] = asyncio.create_task(movie_library_sync_run(interaction, channel, plan, job))
+    _library_sync_jobs[guild_id] = job
+    await interaction.followup.send(f"⏳ Library sync started: {_library_sync_progress_text(job)}", ephemeral=True)
 bot.tree.add_command(config_group)
 bot.tree.add_command(messages_group)
 bot.tree.add_command(schedule_group)
@@ -3953,18 +5314,17 @@ bot.tree.add_command(movies_group)
 ############### ON_READY & BOT START ###############
 @bot.event
 async def on_ready():
-    global active_cleanup_task, plague_cleanup_task, deadchat_cleanup_task, birthday_task, qotd_task
+    global scheduler_task, deadchat_cleanup_task, activity_flush_task, autodelete_task
     await bot.tree.sync()
-    if active_cleanup_task is None:
-        active_cleanup_task = asyncio.create_task(active_cleanup_loop(bot))
-    if plague_cleanup_task is None:
-        plague_cleanup_task = asyncio.create_task(plague_cleanup_loop(bot))
+    if activity_flush_task is None:
+        activity_flush_task = asyncio.create_task(activity_flush_loop())
+    if scheduler_task is None:
+        scheduler_task = asyncio.create_task(scheduler_loop(bot))
+    role_queue_start(bot)
+    if autodelete_task is None:
+        autodelete_task = asyncio.create_task(autodelete_loop(bot))
     if deadchat_cleanup_task is None:
         deadchat_cleanup_task = asyncio.create_task(deadchat_cleanup_loop())
-    if birthday_task is None:
-        birthday_task = asyncio.create_task(birthday_daily_loop(bot))
-    if qotd_task is None:
-        qotd_task = asyncio.create_task(qotd_daily_loop(bot))
     print(f"✅ Logged in as {bot.user} ({bot.user.id})")
 
 async def _safe_reply(interaction: discord.Interaction, content: str):
@@ -4011,17 +5371,30 @@ async def runner():
     if not TOKEN:
         raise RuntimeError("DISCORD_TOKEN or TOKEN is missing")
     await init_db()
+    await open_http()
     try:
         await bot.start(TOKEN)
     finally:
+        try:
+            await flush_activity()
+            await deadchat_checkpoint()
+            await autodelete_flush()
+        except Exception:
+            pass
+        await close_http()
         await close_db()
 
-if __name__ == "__main__":
-    asyncio.run(runner())
-
 # -------- Library browsing UI (dev_library mode) --------
-
-async def movie_library_list(guild_id: int):
+# All open browsers for a guild share one immutable, title-sorted snapshot of the library.
+# Views only hold a keyset cursor (the sort key of their first row), so memory stays flat no
+# matter how many users browse, and a reload never shifts someone onto the wrong page.
+BROWSER_PAGE_SIZE = 25
+_library_snapshots: dict[int, dict] = {}
+
+async def movie_library_snapshot(guild_id: int) -> dict:
+    snap = _library_snapshots.get(int(guild_id))
+    if snap is not None:
+        return snap
     await ensure_movie_tables()
     async with db_pool.acquire() as conn:
         rows = await conn.fetch(
@@ -4029,131 +5402,136 @@ async def movie_library_list(guild_id: int):
             SELECT sheet_key, title
             FROM movie_library_items
             WHERE guild_id=$1 AND active=TRUE
-            ORDER BY title ASC
             """,
             int(guild_id),
         )
-    return [(str(r["sheet_key"]), str(r["title"])) for r in rows]
+    items = sorted(((str(r["title"]).lower(), str(r["sheet_key"]), str(r["title"])) for r in rows))
+    snap = {
+        "keys": tuple((k, sk) for k, sk, _ in items),
+        "titles": tuple(t for _, _, t in items),
+        "by_key": {sk: t for _, sk, t in items},
+    }
+    _library_snapshots[int(guild_id)] = snap
+    return snap
+
+def movie_library_snapshot_invalidate(guild_id: int) -> None:
+    _library_snapshots.pop(int(guild_id), None)
+
+def movie_library_page(snap: dict, cursor: tuple[str, str] | None) -> int:
+    """Index of the first row at or after the keyset cursor."""
+    if cursor is None:
+        return 0
+    start = bisect.bisect_left(snap["keys"], cursor)
+    return max(0, min(start, len(snap["keys"]) - 1))
+
+
+class MovieBrowserJumpModal(discord.ui.Modal, title="Jump to title"):
+    prefix = discord.ui.TextInput(label="Title starts with", max_length=100)
+
+    def __init__(self, view: "MovieBrowserView"):
+        super().__init__()
+        self.browser = view
+
+    async def on_submit(self, interaction: discord.Interaction):
+        snap = await movie_library_snapshot(self.browser.guild_id)
+        start = movie_library_page(snap, (str(self.prefix.value).strip().lower(), ""))
+        await self.browser._show(interaction, snap, start)
 
 
 class MovieBrowserView(discord.ui.View):
-    def __init__(self, guild_id: int, user_id: int, items: list[tuple[str, str]], page: int = 0):
+    def __init__(self, guild_id: int, user_id: int):
         super().__init__(timeout=600)
         self.guild_id = int(guild_id)
         self.user_id = int(user_id)
-        self.items = items
-        self.page = int(page)
-
-        # Build initial select
-        self._rebuild_select()
-
-    def _page_count(self) -> int:
-        if not self.items:
-            return 1
-        return (len(self.items) + 24) // 25
-
-    def _slice(self) -> list[tuple[str, str]]:
-        start = self.page * 25
-        end = start + 25
-        return self.items[start:end]
-
-    def _rebuild_select(self):
-        # Remove existing selects
-        for child in list(self.children):
-            if isinstance(child, discord.ui.Select):
-                self.remove_item(child)
-
-        page_items = self._slice()
-        options = []
-        for sheet_key, title in page_items:
-            label = title[:100]
-            options.append(discord.SelectOption(label=label, value=sheet_key))
-
-        select = discord.ui.Select(placeholder="✅ Select One", min_values=1, max_values=1, options=options)
-
-        async def _select_callback(interaction: discord.Interaction):
-            if interaction.guild is None or int(interaction.guild.id) != self.guild_id:
-                await interaction.response.send_message("❌ Wrong server.", ephemeral=True)
-                return
-            if int(interaction.user.id) != self.user_id:
-                await interaction.response.send_message("❌ This menu isn't for you.", ephemeral=True)
-                return
-
-            sheet_key = select.values[0]
-            title_map = {k: t for k, t in self._slice()}
-            # If the selected key isn't in the current slice (rare), fall back to global map
-            if sheet_key not in title_map:
-                title_map = {k: t for k, t in self.items}
-            picked_title = title_map.get(sheet_key)
-            if not picked_title:
-                await interaction.response.send_message("❌ Could not find that title.", ephemeral=True)
-                return
+        self.cursor: tuple[str, str] | None = None
+        self.select = discord.ui.Select(placeholder="✅ Select One", min_values=1, max_values=1)
+        self.select.callback = self._select_callback
+        self.add_item(self.select)
+
+    def _render(self, snap: dict, start: int) -> discord.Embed:
+        keys = snap["keys"]
+        self.cursor = keys[start] if keys else None
+        page_keys = keys[start:start + BROWSER_PAGE_SIZE]
+        self.select.options = [
+            discord.SelectOption(label=snap["by_key"][sk][:100], value=sk) for _, sk in page_keys
+        ] or [discord.SelectOption(label="No movies found.", value="-")]
+        return build_movie_browser_embed(snap, start)
+
+    async def _show(self, interaction: discord.Interaction, snap: dict, start: int):
+        embed = self._render(snap, start)
+        await interaction.response.edit_message(embed=embed, view=self)
 
-            ok, err = await movie_pool_add(self.guild_id, int(interaction.user.id), picked_title)
-            if not ok:
-                settings = await movie_get_settings(self.guild_id)
-                if err == "duplicate":
-                    await interaction.response.send_message(MOVIE_MSG["pick_duplicate"], ephemeral=True)
-                    return
-                if err == "limit":
-                    limit = int(settings.get("per_user_limit") or 3)
-                    await interaction.response.send_message(
-                        MOVIE_MSG["pick_limit"].replace("{limit}", str(limit)),
-                        ephemeral=True,
-                    )
-                    return
-                await interaction.response.send_message("❌ Could not add that pick.", ephemeral=True)
-                return
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        if interaction.guild is None or int(interaction.guild.id) != self.guild_id:
+            await interaction.response.send_message("❌ Wrong server.", ephemeral=True)
+            return False
+        if int(interaction.user.id) != self.user_id:
+            await interaction.response.send_message("❌ This menu isn't for you.", ephemeral=True)
+            return False
+        return True
 
-            await movie_pool_update_display(interaction.guild)
-            await interaction.response.send_message(
-                MOVIE_MSG["pick_added"].replace("{title}", picked_title),
-                ephemeral=True,
-            )
+    async def _select_callback(self, interaction: discord.Interaction):
+        snap = await movie_library_snapshot(self.guild_id)
+        picked_title = snap["by_key"].get(self.select.values[0])
+        if not picked_title:
+            await interaction.response.send_message("❌ Could not find that title.", ephemeral=True)
+            return
 
-        select.callback = _select_callback
-        self.add_item(select)
+        ok, err = await movie_pool_add(self.guild_id, int(interaction.user.id), picked_title)
+        if not ok:
+            settings = await movie_get_settings(self.guild_id)
+            if err == "duplicate":
+                await interaction.response.send_message(MOVIE_MSG["pick_duplicate"], ephemeral=True)
+                return
+            if err == "limit":
+                limit = int(settings.get("per_user_limit") or 3)
+                await interaction.response.send_message(
+                    MOVIE_MSG["pick_limit"].replace("{limit}", str(limit)),
+                    ephemeral=True,
+                )
+                return
+            await interaction.response.send_message("❌ Could not add that pick.", ephemeral=True)
+            return
 
-    async def _edit(self, interaction: discord.Interaction):
-        # rebuild select options for this page and edit message
-        self._rebuild_select()
-        embed = build_movie_browser_embed(self.items, self.page)
-        await interaction.response.edit_message(embed=embed, view=self)
+        await movie_pool_update_display(interaction.guild)
+        await interaction.response.send_message(
+            MOVIE_MSG["pick_added"].replace("{title}", picked_title),
+            ephemeral=True,
+        )
 
     @discord.ui.button(label="Prev", style=discord.ButtonStyle.secondary)
     async def prev(self, interaction: discord.Interaction, button: discord.ui.Button):
-        if int(interaction.user.id) != self.user_id:
-            await interaction.response.send_message("❌ This menu isn't for you.", ephemeral=True)
-            return
-        self.page = max(0, self.page - 1)
-        await self._edit(interaction)
+        snap = await movie_library_snapshot(self.guild_id)
+        start = movie_library_page(snap, self.cursor)
+        await self._show(interaction, snap, max(0, start - BROWSER_PAGE_SIZE))
 
     @discord.ui.button(label="Next", style=discord.ButtonStyle.secondary)
     async def next(self, interaction: discord.Interaction, button: discord.ui.Button):
-        if int(interaction.user.id) != self.user_id:
-            await interaction.response.send_message("❌ This menu isn't for you.", ephemeral=True)
-            return
-        self.page = min(self._page_count() - 1, self.page + 1)
-        await self._edit(interaction)
+        snap = await movie_library_snapshot(self.guild_id)
+        start = movie_library_page(snap, self.cursor) + BROWSER_PAGE_SIZE
+        if start >= len(snap["keys"]):
+            start = movie_library_page(snap, self.cursor)
+        await self._show(interaction, snap, start)
 
+    @discord.ui.button(label="Jump", style=discord.ButtonStyle.primary)
+    async def jump(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await interaction.response.send_modal(MovieBrowserJumpModal(self))
 
-def build_movie_browser_embed(items: list[tuple[str, str]], page: int) -> discord.Embed:
-    total = len(items)
-    pages = (total + 24) // 25 if total else 1
-    page = max(0, min(int(page), pages - 1))
 
-    start = page * 25
-    end = min(start + 25, total)
+def build_movie_browser_embed(snap: dict, start: int) -> discord.Embed:
+    total = len(snap["keys"])
+    pages = (total + BROWSER_PAGE_SIZE - 1) // BROWSER_PAGE_SIZE if total else 1
+    end = min(start + BROWSER_PAGE_SIZE, total)
     lines = []
-    for i, (_, title) in enumerate(items[start:end], start=start + 1):
-        lines.append(f"{i}. {title}")
+    for i, (_, sk) in enumerate(snap["keys"][start:end], start=start + 1):
+        lines.append(f"{i}. {snap['by_key'][sk]}")
 
     desc = "\n".join(lines) if lines else "No movies found."
     embed = discord.Embed(
         title="Movies",
         description=desc
     )
-    embed.set_footer(text=f"Page {page+1}/{pages} ({total} total)")
+    embed.set_footer(text=f"Page {start // BROWSER_PAGE_SIZE + 1}/{pages} ({total} total)")
     return embed
 
 
@@ -4170,13 +5548,14 @@ async def open_movie_browser(interaction: discord.Interaction):
         await interaction.response.send_message("❌ No movie database is synced for this server.", ephemeral=True)
         return
 
-    items = await movie_library_list(guild_id)
-    if not items:
+    snap = await movie_library_snapshot(guild_id)
+    if not snap["keys"]:
         await interaction.response.send_message("❌ No movie database is synced for this server.", ephemeral=True)
         return
 
-    view = MovieBrowserView(guild_id=guild_id, user_id=int(interaction.user.id), items=items, page=0)
-    embed = build_movie_browser_embed(items, 0)
+    view = MovieBrowserView(guild_id=guild_id, user_id=int(interaction.user.id))
+    embed = view._render(snap, 0)
     await interaction.response.send_message(embed=embed, view=view, ephemeral=True)
 
-
+if __name__ == "__main__":
+    asyncio.run(runner())